@@ -0,0 +1,61 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled Tic Tac Toe negamax over 9-bit bitboards
+
+Bit i is cell i of the flattened board (row * 3 + col), matching WIN_MASKS
+in game.bitboard. Scores follow MinimaxMoveTable: a board the
+previous move won scores -(empties + 1) for the side to move, a full board
+scores 0, so faster wins score higher. Build with
+`python scripts/build_minimax.py`.
+"""
+from libc.stdint cimport uint16_t
+
+cdef uint16_t[8] WIN_MASKS = [0x007, 0x038, 0x1C0, 0x049, 0x092, 0x124, 0x111, 0x054]
+cdef uint16_t FULL = 0x1FF
+
+
+cdef inline bint has_won(uint16_t bits) noexcept nogil:
+    cdef int i
+    for i in range(8):
+        if bits & WIN_MASKS[i] == WIN_MASKS[i]:
+            return True
+    return False
+
+
+cdef inline int popcount(uint16_t bits) noexcept nogil:
+    cdef int count = 0
+    while bits:
+        bits &= bits - 1
+        count += 1
+    return count
+
+
+cdef int negamax(uint16_t me, uint16_t opp, int *best_move) noexcept nogil:
+    """Score for the side to move (`me`); writes its best cell to best_move"""
+    cdef int empties = 9 - popcount(me | opp)
+    cdef int i, score, best_score = -100, child_move
+    cdef uint16_t bit
+
+    best_move[0] = -1
+    if has_won(opp):
+        return -(empties + 1)
+    if empties == 0:
+        return 0
+
+    for i in range(9):
+        bit = 1 << i
+        if (me | opp) & bit:
+            continue
+        score = -negamax(opp, me | bit, &child_move)
+        if score > best_score:
+            best_score = score
+            best_move[0] = i
+    return best_score
+
+
+def solve(int me, int opp):
+    """Return (score, move index or None) for the side owning `me` to move"""
+    cdef int move, score
+    with nogil:
+        score = negamax(<uint16_t>(me & FULL), <uint16_t>(opp & FULL), &move)
+    return score, (move if move >= 0 else None)
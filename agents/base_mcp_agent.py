@@ -3,20 +3,28 @@ Base MCP Agent Class
 Combines CrewAI Agent capabilities with MCP Server communication
 """
 from crewai import Agent, Task
-from typing import Dict, List, Optional, Any, Callable
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, Awaitable, Callable
 import asyncio
-import json
+import inspect
+import logging
+import fastjsonschema
+import orjson
 import time
-from datetime import datetime
+from utils.clock import iso_now
+from utils.llm_pool import run_llm_call
 from abc import ABC, abstractmethod
-import psutil
-import os
+from utils.resources import resource_sampler
 
 # MCP Protocol imports
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Resource, Prompt, PromptMessage
 
+# Set by an MCP server for the duration of a tool call whose client asked for
+# progress; LLM calls made by that tool then stream their text chunks to it
+llm_chunk_sink: ContextVar[Optional[Callable[[str], Awaitable[None]]]] = ContextVar("llm_chunk_sink", default=None)
+
 
 class BaseMCPAgent(Agent, ABC):
     """Base class combining CrewAI Agent with MCP Server capabilities"""
@@ -40,6 +48,8 @@ class BaseMCPAgent(Agent, ABC):
         # Use __dict__ to bypass Pydantic validation issues
         self.__dict__['mcp_port'] = mcp_port
         self.__dict__['agent_id'] = agent_id
+        # Per-call diagnostics go through logging so disabled levels skip formatting
+        self.__dict__['logger'] = logging.getLogger(f"mcp.{agent_id}")
         self.__dict__['mcp_server'] = Server(f"{agent_id}-mcp-server")  # ✨ Real MCP Server
         self.__dict__['mcp_standalone_server'] = None  # Standalone MCP server instance
         self.__dict__['mcp_clients'] = {}
@@ -66,23 +76,39 @@ class BaseMCPAgent(Agent, ABC):
         model_name = getattr(self.llm, 'model', None) or getattr(self.llm, 'model_name', None) or str(self.llm.__class__.__name__)
         self.__dict__['current_model'] = str(model_name)
         self.__dict__['last_request_time'] = None
-        self.__dict__['timestamp'] = datetime.now().isoformat()
+        self.__dict__['timestamp'] = iso_now()
+        self._refresh_agent_info()
         
+    def _refresh_agent_info(self):
+        """Rebuild the static part of get_agent_status (changes only on model switch)"""
+        agent_id = self.__dict__.get('agent_id', 'unknown')
+        self.__dict__['agent_info'] = {
+            "agent_id": str(agent_id),
+            "role": str(agent_id).title() + " Agent",  # Use agent_id as role instead of self.role
+            "current_model": str(self.__dict__.get('current_model', 'unknown')),
+            "mcp_port": int(self.__dict__.get('mcp_port', 0))
+        }
+    
     async def start_mcp_server(self):
         """Start real MCP server with protocol support"""
         agent_id = self.__dict__.get('agent_id', 'unknown')
         mcp_port = self.__dict__.get('mcp_port', 0)
         mcp_server = self.__dict__.get('mcp_server')
+        logger = self.__dict__['logger']
         
         # Setup MCP protocol endpoints
         self.setup_mcp_endpoints()
         
+        # Registries are mutated in place, so handlers can close over them once
+        tools_registry = self.__dict__['tools_registry']
+        resources_registry = self.__dict__['resources_registry']
+        prompts_registry = self.__dict__['prompts_registry']
+        
         # Register MCP protocol handlers
         @mcp_server.list_tools()
         async def list_tools() -> list[Tool]:
             """List all available tools via MCP protocol"""
             tools = []
-            tools_registry = self.__dict__.get('tools_registry', {})
             
             for tool_name, tool_info in tools_registry.items():
                 tools.append(Tool(
@@ -91,14 +117,13 @@ class BaseMCPAgent(Agent, ABC):
                     inputSchema=tool_info.get('inputSchema', {})
                 ))
             
-            print(f"[MCP] {agent_id}: Listed {len(tools)} tools via MCP protocol")
+            logger.debug("Listed %d tools via MCP protocol", len(tools))
             return tools
         
         @mcp_server.list_resources()
         async def list_resources() -> list[Resource]:
             """List all available resources via MCP protocol"""
             resources = []
-            resources_registry = self.__dict__.get('resources_registry', {})
             
             for resource_uri, resource_info in resources_registry.items():
                 resources.append(Resource(
@@ -108,13 +133,12 @@ class BaseMCPAgent(Agent, ABC):
                     mimeType=resource_info.get('mimeType', 'text/plain')
                 ))
             
-            print(f"[MCP] {agent_id}: Listed {len(resources)} resources via MCP protocol")
+            logger.debug("Listed %d resources via MCP protocol", len(resources))
             return resources
         
         @mcp_server.read_resource()
         async def read_resource(uri: str) -> str:
             """Read a specific resource"""
-            resources_registry = self.__dict__.get('resources_registry', {})
             if uri not in resources_registry:
                 raise ValueError(f"Resource '{uri}' not found")
             
@@ -126,7 +150,6 @@ class BaseMCPAgent(Agent, ABC):
         async def list_prompts() -> list[Prompt]:
             """List all available prompts via MCP protocol"""
             prompts = []
-            prompts_registry = self.__dict__.get('prompts_registry', {})
             
             for prompt_name, prompt_info in prompts_registry.items():
                 prompts.append(Prompt(
@@ -135,13 +158,12 @@ class BaseMCPAgent(Agent, ABC):
                     arguments=prompt_info.get('arguments', [])
                 ))
             
-            print(f"[MCP] {agent_id}: Listed {len(prompts)} prompts via MCP protocol")
+            logger.debug("Listed %d prompts via MCP protocol", len(prompts))
             return prompts
         
         @mcp_server.get_prompt()
         async def get_prompt(name: str, arguments: dict = None) -> PromptMessage:
             """Get a specific prompt with optional arguments"""
-            prompts_registry = self.__dict__.get('prompts_registry', {})
             if name not in prompts_registry:
                 raise ValueError(f"Prompt '{name}' not found")
             
@@ -152,13 +174,12 @@ class BaseMCPAgent(Agent, ABC):
         @mcp_server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Call a tool via MCP protocol"""
-            print(f"[MCP] {agent_id}: Tool '{name}' called with args: {arguments}")
+            logger.debug("Tool '%s' called with args: %r", name, arguments)
             
-            tools_registry = self.__dict__.get('tools_registry', {})
             if name not in tools_registry:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({"error": f"Tool '{name}' not found"})
+                    text=orjson.dumps({"error": f"Tool '{name}' not found"}).decode()
                 )]
             
             handler = tools_registry[name]['handler']
@@ -166,12 +187,12 @@ class BaseMCPAgent(Agent, ABC):
                 result = await handler(arguments)
                 return [TextContent(
                     type="text",
-                    text=json.dumps(result)
+                    text=orjson.dumps(result).decode()
                 )]
             except Exception as e:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({"error": str(e)})
+                    text=orjson.dumps({"error": str(e)}).decode()
                 )]
         
         # MCP server is registered and ready
@@ -181,7 +202,7 @@ class BaseMCPAgent(Agent, ABC):
         self.__dict__['is_running'] = True
         print(f"✅ MCP Server registered for {agent_id}")
         print(f"   Designated Port: {mcp_port}")
-        print(f"   Tools Registered: {len(self.__dict__.get('tools_registry', {}))}")
+        print(f"   Tools Registered: {len(self.__dict__['tools_registry'])}")
         print(f"   🔍 MCP Inspector URL: http://localhost:8000/mcp/{agent_id}")
     
     def setup_mcp_endpoints(self):
@@ -302,17 +323,24 @@ Provide a structured response with your analysis and recommendations."""
         )
     
     def register_mcp_tool(self, name: str, handler, description: str, input_schema: dict):
-        """Register a tool with the MCP server"""
+        """Register a tool with the MCP server
+
+        Handlers must return orjson-native values (dict/list/str/int/float/
+        bool/None, datetime, UUID); results are serialized without a fallback.
+        """
         agent_id = self.__dict__.get('agent_id', 'unknown')
-        tools_registry = self.__dict__.get('tools_registry', {})
+        tools_registry = self.__dict__['tools_registry']
         
         tools_registry[name] = {
             'handler': handler,
             'description': description,
-            'inputSchema': input_schema
+            'inputSchema': input_schema,
+            # Resolved once here so tool calls don't introspect the handler
+            'needs_args': len(inspect.signature(handler).parameters) > 0,
+            # Compiled once; raises fastjsonschema.JsonSchemaException on bad arguments
+            'validator': fastjsonschema.compile(input_schema)
         }
         
-        self.__dict__['tools_registry'] = tools_registry
         print(f"[MCP] Registered tool '{name}' for {agent_id}")
     
     # Alias for backward compatibility
@@ -327,9 +355,12 @@ Provide a structured response with your analysis and recommendations."""
     
     def register_mcp_resource(self, uri: str, name: str, description: str, 
                              getter: Callable, mime_type: str = "application/json"):
-        """Register a resource with the MCP server"""
+        """Register a resource with the MCP server
+
+        Getters follow the same orjson-native return contract as tools.
+        """
         agent_id = self.__dict__.get('agent_id', 'unknown')
-        resources_registry = self.__dict__.get('resources_registry', {})
+        resources_registry = self.__dict__['resources_registry']
         
         resources_registry[uri] = {
             'name': name,
@@ -338,14 +369,13 @@ Provide a structured response with your analysis and recommendations."""
             'mimeType': mime_type
         }
         
-        self.__dict__['resources_registry'] = resources_registry
         print(f"[MCP] Registered resource '{name}' ({uri}) for {agent_id}")
     
     def register_mcp_prompt(self, name: str, description: str, 
                            generator: Callable, arguments: list = None):
         """Register a prompt template with the MCP server"""
         agent_id = self.__dict__.get('agent_id', 'unknown')
-        prompts_registry = self.__dict__.get('prompts_registry', {})
+        prompts_registry = self.__dict__['prompts_registry']
         
         prompts_registry[name] = {
             'description': description,
@@ -353,20 +383,16 @@ Provide a structured response with your analysis and recommendations."""
             'arguments': arguments or []
         }
         
-        self.__dict__['prompts_registry'] = prompts_registry
         print(f"[MCP] Registered prompt '{name}' for {agent_id}")
     
     def track_request(self, response_time: float = None, success: bool = True, tokens: int = 0):
         """Track a request for this agent with enhanced metrics"""
-        agent_id = self.__dict__.get('agent_id', 'unknown')
-        current_count = self.__dict__.get('request_count', 0)
-        print(f"[METRICS] {agent_id}.track_request called! Current count: {current_count}")
+        logger = self.__dict__['logger']
         
         self.__dict__['request_count'] += 1
-        self.__dict__['last_request_time'] = datetime.now().isoformat()
-        self.__dict__['timestamp'] = datetime.now().isoformat()
+        self.__dict__['last_request_time'] = self.__dict__['timestamp'] = iso_now()
         
-        print(f"[METRICS] {agent_id} new count: {self.__dict__['request_count']}")
+        logger.debug("[METRICS] request count: %d", self.__dict__['request_count'])
         
         # Track response time metrics
         if response_time is not None:
@@ -381,9 +407,12 @@ Provide a structured response with your analysis and recommendations."""
             if response_time > self.__dict__['max_response_time']:
                 self.__dict__['max_response_time'] = response_time
             
-            print(f"[METRICS] {agent_id} avg: {self.__dict__['avg_response_time']:.6f}s, min: {self.__dict__['min_response_time']:.6f}s, max: {self.__dict__['max_response_time']:.6f}s")
+            logger.debug("[METRICS] avg: %.6fs, min: %.6fs, max: %.6fs",
+                         self.__dict__['avg_response_time'],
+                         self.__dict__['min_response_time'],
+                         self.__dict__['max_response_time'])
         else:
-            print(f"[METRICS] {agent_id} WARNING: response_time is None!")
+            logger.warning("[METRICS] response_time is None")
         
         # Track API success/failure
         self.__dict__['api_call_count'] += 1
@@ -395,57 +424,70 @@ Provide a structured response with your analysis and recommendations."""
         # Track token usage
         if tokens > 0:
             self.__dict__['total_tokens'] += tokens
-            print(f"[METRICS] {agent_id} total tokens: {self.__dict__['total_tokens']}")
+            logger.debug("[METRICS] total tokens: %d", self.__dict__['total_tokens'])
     
     async def execute(self, task: Task) -> str:
         """Execute a CrewAI task - simplified implementation"""
-        print(f"[DEBUG] BaseMCPAgent.execute called with task: {task.description[:100]}...")
-        
-        # Get the task description
-        description = task.description
+        return await self.execute_prompt(task.description)
+    
+    async def execute_prompt(self, description: str) -> str:
+        """Run a task description through the agent's LLM"""
+        logger = self.__dict__['logger']
+        logger.debug("execute called with task: %.100s...", description)
         
         # Use the agent's LLM to process the task
         if hasattr(self, 'llm') and self.llm:
-            print(f"[DEBUG] BaseMCPAgent: LLM available, calling _tracked_llm_call")
+            logger.debug("LLM available, calling _tracked_llm_call")
             try:
                 response = await self._tracked_llm_call(description)
-                print(f"[DEBUG] BaseMCPAgent: LLM call successful, response length: {len(str(response))}")
+                logger.debug("LLM call successful, response length: %d", len(response))
                 return str(response)
             except Exception as e:
-                print(f"[DEBUG] BaseMCPAgent: LLM call failed with exception: {type(e).__name__}: {str(e)}")
+                logger.debug("LLM call failed with exception: %s: %s", type(e).__name__, e)
                 raise e
         else:
-            print(f"[DEBUG] BaseMCPAgent: No LLM available, using fallback")
+            logger.debug("No LLM available, using fallback")
             # Fallback response
             return f"Task executed: {description[:100]}..."
     
     async def _tracked_llm_call(self, prompt: str) -> str:
         """Make an LLM call with metrics tracking"""
-        print(f"[DEBUG] _tracked_llm_call: Starting LLM call with prompt length: {len(prompt)}")
+        logger = self.__dict__['logger']
+        logger.debug("_tracked_llm_call: Starting LLM call with prompt length: %d", len(prompt))
         start_time = time.time()
         
         try:
-            print(f"[DEBUG] _tracked_llm_call: Calling self.llm.call with asyncio.to_thread")
-            # Make the LLM call
-            response = await asyncio.to_thread(self.llm.call, prompt)
-            print(f"[DEBUG] _tracked_llm_call: LLM call completed, response type: {type(response)}")
+            # Make the LLM call, natively async when the client supports it
+            sink = llm_chunk_sink.get()
+            astream = getattr(self.llm, 'astream', None)
+            acall = getattr(self.llm, 'acall', None)
+            if sink is not None and astream is not None:
+                # Forward chunks as they arrive; the caller still gets the whole text
+                parts = []
+                async for chunk in astream(prompt):
+                    text = getattr(chunk, 'content', chunk)
+                    parts.append(text)
+                    await sink(text)
+                response = "".join(parts)
+            elif acall is not None:
+                response = await acall(prompt)
+            else:
+                response = await run_llm_call(self.llm.call, prompt)
             
             # Calculate response time
             response_time = time.time() - start_time
-            print(f"[DEBUG] _tracked_llm_call: Response time: {response_time:.3f}s")
+            logger.debug("_tracked_llm_call: Response time: %.3fs", response_time)
             
             # Update metrics
             self._update_metrics(response_time, success=True)
-            print(f"[DEBUG] _tracked_llm_call: Metrics updated successfully")
             
             return response
             
         except Exception as e:
-            print(f"[DEBUG] _tracked_llm_call: Exception occurred: {type(e).__name__}: {str(e)}")
+            logger.debug("_tracked_llm_call: Exception occurred: %s: %s", type(e).__name__, e)
             # Update metrics for failure
             response_time = time.time() - start_time
             self._update_metrics(response_time, success=False)
-            print(f"[DEBUG] _tracked_llm_call: Metrics updated for failure")
             raise e
     
     def _update_metrics(self, response_time: float, success: bool = True):
@@ -481,8 +523,7 @@ Provide a structured response with your analysis and recommendations."""
     def track_timeout(self):
         """Track a timeout event"""
         self.__dict__['timeout_count'] = self.__dict__.get('timeout_count', 0) + 1
-        agent_id = self.__dict__.get('agent_id', 'unknown')
-        print(f"[METRICS] {agent_id} timeout count: {self.__dict__['timeout_count']}")
+        self.__dict__['logger'].info("[METRICS] timeout count: %d", self.__dict__['timeout_count'])
     
     
     async def mcp_execute_task(self, task_data: Dict) -> Dict:
@@ -497,8 +538,8 @@ Provide a structured response with your analysis and recommendations."""
                 context=task_data.get("context", [])
             )
             
-            # Execute using CrewAI's execution engine
-            result = await asyncio.to_thread(self.execute, task)
+            # execute is a coroutine; it runs the LLM call on the shared pool
+            result = await self.execute(task)
             
             # Track performance
             response_time = asyncio.get_event_loop().time() - start_time
@@ -513,7 +554,7 @@ Provide a structured response with your analysis and recommendations."""
                 "result": result,
                 "agent_id": agent_id,
                 "response_time": response_time,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             }
             
         except Exception as e:
@@ -522,22 +563,18 @@ Provide a structured response with your analysis and recommendations."""
                 "success": False,
                 "error": str(e),
                 "agent_id": agent_id,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             }
     
     async def get_agent_status(self) -> Dict:
         """Get current agent status"""
-        agent_id = self.__dict__.get('agent_id', 'unknown')
-        is_running = self.__dict__.get('is_running', False)
-        current_model = self.__dict__.get('current_model', 'unknown')
-        mcp_port = self.__dict__.get('mcp_port', 0)
-        
+        agent_info = self.__dict__['agent_info']
         return {
-            "agent_id": str(agent_id),
-            "role": str(agent_id).title() + " Agent",  # Use agent_id as role instead of self.role
-            "is_running": bool(is_running),
-            "current_model": str(current_model),
-            "mcp_port": int(mcp_port),
+            "agent_id": agent_info["agent_id"],
+            "role": agent_info["role"],
+            "is_running": bool(self.__dict__.get('is_running', False)),
+            "current_model": agent_info["current_model"],
+            "mcp_port": agent_info["mcp_port"],
             "memory_size": int(self._get_memory_size())
         }
     
@@ -548,7 +585,7 @@ Provide a structured response with your analysis and recommendations."""
         return {
             "agent_id": agent_id,
             "memory_data": "Memory content here",  # Serialize actual memory
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     
     async def switch_llm_model(self, model_config: Dict) -> Dict:
@@ -567,6 +604,7 @@ Provide a structured response with your analysis and recommendations."""
                 # Replace the old LLM with the new one
                 self.llm = new_llm
                 self.__dict__['current_model'] = new_model
+                self._refresh_agent_info()
                 
                 agent_id = self.__dict__.get('agent_id', 'unknown')
                 return {
@@ -634,7 +672,7 @@ Provide a structured response with your analysis and recommendations."""
             
             # Memory (process-level)
             "memory_usage": self.get_memory_usage(),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     
     def _get_memory_size(self) -> int:
@@ -649,8 +687,7 @@ Provide a structured response with your analysis and recommendations."""
     def get_memory_usage(self) -> float:
         """Get memory usage in MB"""
         try:
-            process = psutil.Process(os.getpid())
-            return round(process.memory_info().rss / 1024 / 1024, 2)
+            return round(resource_sampler.process_memory_mb, 2)
         except Exception:
             return 0.0
     
@@ -5,25 +5,90 @@ Replaces CrewAI Executor with direct LangChain implementation
 
 import json
 import asyncio
-from typing import Dict, List, Any, Optional
-from langchain.schema import HumanMessage, SystemMessage
+import logging
+import time
+from typing import Dict, List, Any, Optional, Annotated
+import msgspec
+from langchain.schema import HumanMessage, SystemMessage, BaseOutputParser, OutputParserException
 from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
 from models.shared_llm import SharedLLMConnection
+from game import bitboard
 
+logger = logging.getLogger(__name__)
 
-class MoveExecution(BaseModel):
+
+class MoveExecution(msgspec.Struct):
     """Structured output for move execution"""
-    move: Dict[str, int] = Field(description="Move to execute with row and col")
-    validation: str = Field(description="Move validation result")
-    execution_status: str = Field(description="Execution status: SUCCESS, FAILED, INVALID")
-    reasoning: str = Field(description="Reasoning for the move execution")
+    move: Annotated[Dict[str, int], msgspec.Meta(description="Move to execute with row and col")]
+    validation: Annotated[str, msgspec.Meta(description="Move validation result")]
+    execution_status: Annotated[str, msgspec.Meta(description="Execution status: SUCCESS, FAILED, INVALID")]
+    reasoning: Annotated[str, msgspec.Meta(description="Reasoning for the move execution")]
+
+
+class MsgspecOutputParser(BaseOutputParser):
+    """Parse LLM JSON output straight into a msgspec Struct"""
+
+    struct_type: Any
+
+    def parse(self, text: str) -> Any:
+        """Decode the JSON object in the LLM response, ignoring markdown fences"""
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end < start:
+            raise OutputParserException(f"No JSON object found in output: {text}")
+        try:
+            return msgspec.json.decode(text[start:end + 1], type=self.struct_type)
+        except msgspec.ValidationError as e:
+            raise OutputParserException(f"Invalid {self.struct_type.__name__} output: {e}")
+        except msgspec.DecodeError as e:
+            raise OutputParserException(f"Malformed JSON output: {e}")
+
+    def get_format_instructions(self) -> str:
+        """Describe the expected JSON schema to the LLM"""
+        schema = json.dumps(msgspec.json.schema(self.struct_type))
+        return f"The output should be a JSON object that conforms to this JSON schema:\n{schema}"
+
+    @property
+    def _type(self) -> str:
+        return "msgspec"
+
+
+SYSTEM_TEMPLATE = """You are a Tic-Tac-Toe move execution expert. Your job is to validate and execute moves.
+
+VALIDATION RULES:
+1. Check if the move is within bounds (0-2 for row and col)
+2. Check if the position is empty
+3. Ensure the move follows Tic-Tac-Toe rules
+
+EXECUTION:
+- If valid, execute the move
+- If invalid, provide a valid alternative
+- Always provide clear reasoning
+
+{format_instructions}"""
+
+HUMAN_TEMPLATE = """Execute this Tic-Tac-Toe move:
+Recommended Move: {recommended_move}
+Board: {board}
+Strategy: {strategy}
+Current Player: {current_player}
+
+Validate and execute the move:"""
 
 
 class ExecutorLangChain:
     """LangChain-based Executor agent for move execution"""
 
+    # Failure results only differ in the error message
+    _FALLBACK_MOVE = {"row": 1, "col": 1}  # Fallback to center
+    _ERROR_RESULT_TEMPLATE = {
+        "success": False,
+        "error": "",
+        "move": _FALLBACK_MOVE,
+        "validation": "Failed validation",
+        "execution_status": "FAILED",
+        "reasoning": "Move execution failed, using fallback"
+    }
+
     def __init__(self, shared_llm: Optional[SharedLLMConnection] = None, model_name: str = "gpt-5-mini"):
         """
         Initialize Executor agent
@@ -44,40 +109,22 @@ class ExecutorLangChain:
             self.model_name = model_name
             print(f"⚠️ ExecutorLangChain creating own LLM connection: {self.model_name}")
 
-        self.parser = PydanticOutputParser(pydantic_object=MoveExecution)
+        self.parser = MsgspecOutputParser(struct_type=MoveExecution)
 
-        # Create the prompt template
+        # Render the system message once; only the human turn varies per call
+        self._system_msg = SystemMessage(
+            content=SYSTEM_TEMPLATE.format(format_instructions=self.parser.get_format_instructions())
+        )
         self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a Tic-Tac-Toe move execution expert. Your job is to validate and execute moves.
-
-VALIDATION RULES:
-1. Check if the move is within bounds (0-2 for row and col)
-2. Check if the position is empty
-3. Ensure the move follows Tic-Tac-Toe rules
-
-EXECUTION:
-- If valid, execute the move
-- If invalid, provide a valid alternative
-- Always provide clear reasoning
-
-{format_instructions}"""),
-            ("human", """Execute this Tic-Tac-Toe move:
-Recommended Move: {recommended_move}
-Board: {board}
-Strategy: {strategy}
-Current Player: {current_player}
-
-Validate and execute the move:""")
+            self._system_msg,
+            ("human", HUMAN_TEMPLATE)
         ])
     
     async def execute_move(self, execution_input: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a move based on strategy recommendation"""
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            print(f"[DEBUG] ExecutorLangChain: Starting move execution")
-            
             # Prepare the input
             recommended_move = execution_input.get("recommended_move", {})
             board = execution_input.get("board", [])
@@ -88,20 +135,19 @@ Validate and execute the move:""")
             chain = self.prompt | self.llm | self.parser
             
             # Make the call
-            llm_start = time.time()
+            llm_start = time.perf_counter()
             result = await chain.ainvoke({
-                "recommended_move": json.dumps(recommended_move),
-                "board": json.dumps(board),
+                "recommended_move": msgspec.json.encode(recommended_move).decode(),
+                "board": bitboard.board_json(board),
                 "strategy": strategy,
-                "current_player": current_player,
-                "format_instructions": self.parser.get_format_instructions()
+                "current_player": current_player
             })
-            llm_duration = time.time() - llm_start
+            llm_duration = time.perf_counter() - llm_start
             
-            total_duration = time.time() - start_time
+            total_duration = time.perf_counter() - start_time
             overhead = total_duration - llm_duration
-            print(f"[DEBUG] ExecutorLangChain: Move execution completed")
-            print(f"[TIMING] Executor Agent - LLM: {llm_duration:.3f}s, Overhead: {overhead:.3f}s, Total: {total_duration:.3f}s")
+            logger.debug("Executor Agent - LLM: %.3fs, Overhead: %.3fs, Total: %.3fs",
+                         llm_duration, overhead, total_duration)
             
             return {
                 "success": True,
@@ -112,17 +158,16 @@ Validate and execute the move:""")
             }
             
         except Exception as e:
-            total_duration = time.time() - start_time
-            print(f"[DEBUG] ExecutorLangChain: Move execution failed: {e}")
-            print(f"[TIMING] Executor Agent - FAILED after {total_duration:.3f}s")
-            return {
-                "success": False,
-                "error": str(e),
-                "move": {"row": 1, "col": 1},  # Fallback to center
-                "validation": "Failed validation",
-                "execution_status": "FAILED",
-                "reasoning": "Move execution failed, using fallback"
-            }
+            total_duration = time.perf_counter() - start_time
+            logger.debug("ExecutorLangChain: Move execution failed after %.3fs: %s", total_duration, e)
+            return self._create_error_result(str(e))
+    
+    def _create_error_result(self, error_message: str) -> Dict[str, Any]:
+        """Build a failed execution result from the shared template"""
+        result = dict(self._ERROR_RESULT_TEMPLATE)
+        result["error"] = error_message
+        result["move"] = dict(self._FALLBACK_MOVE)
+        return result
     
     async def validate_move(self, move: Dict[str, int], board: List[List[str]]) -> Dict[str, Any]:
         """Validate a move"""
@@ -5,15 +5,25 @@ Executor agent with MCP capabilities for distributed communication
 from .base_mcp_agent import BaseMCPAgent
 from crewai import Task
 from typing import Dict, List
+from contextlib import asynccontextmanager
 import asyncio
 import json
-from datetime import datetime
+import time
 from models.factory import ModelFactory
 from utils.config import config
+from utils.llm_pool import run_llm_call
+
+# Response timestamps are monotonic nanoseconds; they only order and time agent replies
+_now = time.monotonic_ns
 
 
 class ExecutorMCPAgent(BaseMCPAgent):
-    """Executor agent with MCP capabilities"""
+    """Executor agent with MCP capabilities
+
+    An instance is not safe to share between concurrent requests: the CrewAI
+    agent and its metrics are mutated during execution. Serve concurrent
+    callers through ExecutorAgentPool, which checks out one instance per request.
+    """
     
     def __init__(self, model_config: Dict):
         # Create LLM first
@@ -138,7 +148,7 @@ class ExecutorMCPAgent(BaseMCPAgent):
                 short_prompt = f"""Execute Tic Tac Toe move: {json.dumps(recommended_move)}
 Confirm execution and provide result.
 Keep response concise."""
-                execution_result = await asyncio.to_thread(self.llm.call, short_prompt)
+                execution_result = await run_llm_call(self.llm.call, short_prompt)
             
             return {
                 "agent_id": "executor",
@@ -146,7 +156,7 @@ Keep response concise."""
                 "result": execution_result,
                 "success": True,
                 "game_state": "updated",  # TODO: Get actual game state
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": _now()
             }
             
         except Exception as e:
@@ -154,63 +164,60 @@ Keep response concise."""
     
     async def validate_move(self, move_data: Dict) -> Dict:
         """Validate if a move is legal and strategic"""
-        validation_task = Task(
-            description=f"Validate this move: {move_data}",
-            expected_output="Move validation with legal and strategic assessment"
-        )
-        
-        try:
-            result = await self.execute(validation_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(validation_task.description)
+        # Prompts go straight to the LLM; no Task object is built or shared between calls
+        result = await self.execute_prompt(f"Validate this move: {move_data}")
         
         return {
             "agent_id": "executor",
             "validation": result,
             "is_legal": True,  # Extract from result
             "is_strategic": True,  # Extract from result
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     async def update_game_state(self, state_data: Dict) -> Dict:
         """Update the game state after move execution"""
-        update_task = Task(
-            description=f"Update game state with: {state_data}",
-            expected_output="Updated game state confirmation"
-        )
-        
-        try:
-            result = await self.execute(update_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(update_task.description)
+        result = await self.execute_prompt(f"Update game state with: {state_data}")
         
         return {
             "agent_id": "executor",
             "state_update": result,
             "success": True,
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     async def confirm_execution(self, execution_data: Dict) -> Dict:
         """Confirm successful move execution"""
-        confirmation_task = Task(
-            description=f"Confirm execution of: {execution_data}",
-            expected_output="Execution confirmation with details"
-        )
-        
-        try:
-            result = await self.execute(confirmation_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(confirmation_task.description)
+        result = await self.execute_prompt(f"Confirm execution of: {execution_data}")
         
         return {
             "agent_id": "executor",
             "confirmation": result,
             "execution_successful": True,
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     def create_llm(self, model_config: Dict):
         """Create LLM instance based on config"""
         model_name = model_config.get("model", "gpt-4")
         return ModelFactory.create_llm(model_name)
+
+
+class ExecutorAgentPool:
+    """Pool of ExecutorMCPAgent instances, one checked out per concurrent request"""
+
+    def __init__(self, size: int, model_config: Dict):
+        self.size = max(1, size)
+        self.agents = [ExecutorMCPAgent(model_config) for _ in range(self.size)]
+        self._queue = asyncio.Queue()
+        for agent in self.agents:
+            self._queue.put_nowait(agent)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Check out an agent for the duration of a single request"""
+        agent = await self._queue.get()
+        try:
+            yield agent
+        finally:
+            self._queue.put_nowait(agent)
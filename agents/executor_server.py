@@ -4,22 +4,41 @@ Simplified Executor Agent MCP Server
 Focuses on MCP protocol only, using MCPServerAdapter
 """
 import asyncio
+import logging
 import sys
 import os
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import Tool, TextContent
 import uvicorn
+from contextlib import asynccontextmanager
 from starlette.applications import Starlette
 from starlette.routing import Route
-from starlette.responses import JSONResponse
-import json
+from starlette.responses import Response
+import orjson
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default asyncio loop
+    uvloop = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.executor_local import ExecutorMCPAgent
+from agents.executor_local import ExecutorAgentPool
 from models.factory import ModelFactory
+from utils.config import config
+
+UVICORN_OPTIONS = {
+    "host": "0.0.0.0",
+    "http": "httptools",
+    "log_level": "warning",
+    # Per-request access lines dominate CPU for small JSON-RPC payloads
+    "access_log": False,
+    # Keep MCP client connections open across bursts of small JSON-RPC calls
+    "timeout_keep_alive": 75,
+}
 
 class SimplifiedExecutorServer:
     """Simplified Executor MCP Server using standard MCP protocol"""
@@ -27,8 +46,12 @@ class SimplifiedExecutorServer:
     def __init__(self, port=3003):
         self.port = port
         self.agent = None
+        self.pool = None
+        self.tools_registry = {}
         self.server = Server("executor-mcp-server")
         self.app = None
+        self.health_bytes = b""
+        self.init_options = None
         
     async def initialize_agent(self):
         """Initialize the executor agent"""
@@ -39,10 +62,15 @@ class SimplifiedExecutorServer:
         model = available_models.get("executor", "gpt-5-mini")
         
         print(f"   Model: {model}")
-        self.agent = ExecutorMCPAgent({"model": model})
+        # One agent instance per concurrent request; the first serves tool metadata
+        self.pool = ExecutorAgentPool(config.get_agent_pool_size(), {"model": model})
+        self.agent = self.pool.agents[0]
+        print(f"   Pool Size: {self.pool.size}")
         
         # Start MCP server to register tools
-        await self.agent.start_mcp_server()
+        for agent in self.pool.agents:
+            await agent.start_mcp_server()
+        self.tools_registry = self.agent.tools_registry
         
         # Register MCP tools
         await self._register_tools()
@@ -54,40 +82,41 @@ class SimplifiedExecutorServer:
             return
             
         # Get tools from agent
-        tools_registry = self.agent.__dict__.get('tools_registry', {})
+        tools_registry = self.tools_registry
         print(f"[DEBUG] Executor tools registry: {tools_registry}")
         
-        for tool_name, tool_info in tools_registry.items():
-            @self.server.list_tools()
-            async def list_tools() -> list[Tool]:
-                tools = []
-                if self.agent:
-                    tools_registry = self.agent.__dict__.get('tools_registry', {})
-                    for name, tool_info in tools_registry.items():
-                        tools.append(Tool(
-                            name=name,
-                            description=tool_info.get('description', ''),
-                            inputSchema=tool_info.get('schema', {})
-                        ))
-                return tools
-            
-            @self.server.call_tool()
-            async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-                if self.agent and name in self.agent.__dict__.get('tools_registry', {}):
-                    try:
-                        handler = self.agent.__dict__['tools_registry'][name]['handler']
+        # Tool listing is static after registration, so build it once
+        tools = [
+            Tool(
+                name=name,
+                description=tool_info.get('description', ''),
+                inputSchema=tool_info.get('inputSchema', {})
+            )
+            for name, tool_info in tools_registry.items()
+        ]
+        
+        @self.server.list_tools()
+        async def list_tools() -> list[Tool]:
+            return tools
+        
+        @self.server.call_tool()
+        async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+            if name in self.tools_registry:
+                try:
+                    async with self.pool.acquire() as agent:
+                        handler = agent.tools_registry[name]['handler']
                         result = await handler(arguments)
-                        return [TextContent(type="text", text=str(result))]
-                    except Exception as e:
-                        return [TextContent(
-                            type="text", 
-                            text=json.dumps({"error": str(e)})
-                        )]
-                else:
+                    return [TextContent(type="text", text=orjson.dumps(result).decode())]
+                except Exception as e:
                     return [TextContent(
-                        type="text",
-                        text=json.dumps({"error": f"Tool '{name}' not found"})
+                        type="text", 
+                        text=orjson.dumps({"error": str(e)}).decode()
                     )]
+            else:
+                return [TextContent(
+                    type="text",
+                    text=orjson.dumps({"error": f"Tool '{name}' not found"}).decode()
+                )]
     
     def create_app(self) -> Starlette:
         """Create Starlette app with MCP SSE transport"""
@@ -99,21 +128,34 @@ class SimplifiedExecutorServer:
             """Handle SSE connection requests"""
             async with sse_transport.connect_sse(request.scope, request.receive, request.send) as (read_stream, write_stream):
                 # Run the MCP server with the SSE streams
-                await self.server.run(read_stream, write_stream)
+                await self.server.run(read_stream, write_stream, self.init_options)
         
         async def handle_messages(request):
             """Handle MCP message requests"""
             return await sse_transport.handle_post_message(request.scope, request.receive, request.send)
         
-        async def handle_health(request):
-            """Health check endpoint"""
-            return JSONResponse({
+        @asynccontextmanager
+        async def lifespan(app):
+            # Initialize inside the serving loop so each worker process builds its own agents
+            await self.initialize_agent()
+            # Capabilities depend on the registered handlers, so build them once afterwards
+            self.init_options = self.server.create_initialization_options()
+            # Health response is fixed once the agent is initialized, so encode it once
+            self.health_bytes = orjson.dumps({
                 "status": "healthy",
                 "agent_id": "executor",
                 "mcp_version": "1.0",
                 "transport": "sse",
-                "tools_count": len(self.agent.__dict__.get('tools_registry', {})) if self.agent else 0
+                "model": self.agent.current_model,
+                "tools_count": len(self.tools_registry)
             })
+            yield
+            # Release the LLM clients' pooled connections
+            await ModelFactory.aclose()
+        
+        async def handle_health(request):
+            """Health check endpoint"""
+            return Response(self.health_bytes, media_type="application/json")
         
         routes = [
             Route("/", handle_sse, methods=["GET"]),
@@ -121,7 +163,7 @@ class SimplifiedExecutorServer:
             Route("/health", handle_health, methods=["GET"])
         ]
         
-        app = Starlette(debug=True, routes=routes)
+        app = Starlette(debug=True, routes=routes, lifespan=lifespan)
         return app
     
     async def run(self):
@@ -130,26 +172,40 @@ class SimplifiedExecutorServer:
         print(f"   MCP Endpoint: http://localhost:{self.port}/")
         print(f"   Health Check: http://localhost:{self.port}/health")
         
-        # Initialize agent
-        await self.initialize_agent()
-        
-        # Create app
+        # Create app; the agent is initialized by the app lifespan
         self.app = self.create_app()
         
         # Run server
-        config = uvicorn.Config(
-            self.app,
-            host="0.0.0.0",
-            port=self.port,
-            log_level="info"
-        )
+        config = uvicorn.Config(self.app, port=self.port, **UVICORN_OPTIONS)
         server = uvicorn.Server(config)
         await server.serve()
 
+def create_app() -> Starlette:
+    """App factory used by uvicorn worker processes"""
+    return SimplifiedExecutorServer().create_app()
+
 async def main():
     """Main entry point"""
     server = SimplifiedExecutorServer()
     await server.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Per-call agent diagnostics are logged at DEBUG; set LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    # SSE sessions live in the worker that accepted them, so more than one
+    # worker needs a session-affine load balancer in front of this port
+    workers = int(os.getenv("EXECUTOR_WORKERS", "1"))
+    if workers > 1:
+        print(f"🚀 Starting Executor MCP Server on port 3003 with {workers} workers")
+        uvicorn.run(
+            "agents.executor_server:create_app",
+            factory=True,
+            port=3003,
+            workers=workers,
+            loop="uvloop" if uvloop else "asyncio",
+            **UVICORN_OPTIONS
+        )
+    elif uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
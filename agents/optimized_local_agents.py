@@ -9,21 +9,217 @@ Optimized Local Agents for True Local Mode
 """
 
 import asyncio
+import atexit
 import json
+import logging
+import logging.handlers
+import orjson
+import queue
+import sys
 import time
 from typing import Dict, List, Optional, Any
 import os
 
+from langchain_core.messages import HumanMessage, SystemMessage
+
 # Import shared LLM connection from common module
 from models.shared_llm import SharedLLMConnection
+from game.bitboard import (
+    CELLS, CENTER_MASK, CORNER_MASK, FULL_MASK, INVERSE_TABLES, WIN_MASKS, board_json, board_masks,
+    canonical, completing_mask
+)
+
+# Compiled negamax (scripts/build_minimax.py); the pure-Python solver is the fallback
+try:
+    from agents import _minimax as _cminimax
+except ImportError:
+    _cminimax = None
+
+logger = logging.getLogger(__name__)
+_log_queue: queue.Queue = queue.Queue(maxsize=1024)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _start_log_listener():
+    """Route this module's per-turn logging through a queue to a background writer
+
+    Move-generation coroutines only enqueue records; the QueueListener
+    thread does the stdout writes, so game turns never block on the
+    stdout lock. Safe to call more than once.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_DroppingQueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_listener = logging.handlers.QueueListener(_log_queue, stream_handler)
+    _log_listener.start()
+    # Flush anything still queued on interpreter exit
+    atexit.register(_log_listener.stop)
+
+
+def _empty_cells(board: List[List[str]]) -> List[List[int]]:
+    """Return [row, col] for every empty cell"""
+    return [[i, j] for i, j in CELLS if board[i][j] == ""]
+
+
+def _completing_cells(own: int, empty: int) -> List[List[int]]:
+    """Return [row, col] of each empty cell that completes a line for own"""
+    cells = completing_mask(own, empty)
+    return [[i, j] for bit, (i, j) in enumerate(CELLS) if cells >> bit & 1]
+
+
+def _task(description: str, instructions: str, input_template: str) -> Dict[str, Any]:
+    """Build a pre-created task: fixed instructions plus a per-call input template
+
+    Instructions go first as a prebuilt system message so every call for a task
+    shares the same prompt prefix (reused by backend prompt/KV caches); only the
+    short input suffix is formatted per call.
+    """
+    return {
+        "description": description,
+        "system_message": SystemMessage(content=instructions),
+        "input_template": input_template
+    }
+
+
+def _task_messages(task: Dict[str, Any], **fields) -> List:
+    """Render a pre-created task into [system, human] messages"""
+    if task is None:
+        # The caller's fallback path logs this, so an agent used without warmup() is visible
+        raise RuntimeError("LLM task was never created; call warmup() first")
+    return [task["system_message"], HumanMessage(content=task["input_template"].format(**fields))]
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a prompt fragment to compact JSON text"""
+    return orjson.dumps(value).decode()
+
+
+# Board used to prime the model during warmup
+_EMPTY_BOARD_JSON = '[["","",""],["","",""],["","",""]]'
+
+
+async def _prime(llm, task: Dict[str, Any], **fields) -> bool:
+    """Send one warmup call sharing the task's prompt prefix
+
+    Loads the model and fills the backend's prefix cache so the first real
+    move does not pay cold-start latency. The long timeout covers model load.
+    """
+    try:
+        await asyncio.wait_for(llm.ainvoke(_task_messages(task, **fields)), timeout=60.0)
+        return True
+    except Exception as e:
+        print(f"⚠️ LLM priming failed ({type(e).__name__}: {e}), first move will be cold")
+        return False
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _extract_json(content: str) -> Optional[Dict[str, Any]]:
+    """Return the first JSON object embedded in content, or None
+
+    raw_decode handles nested objects that a brace regex would cut short.
+    """
+    start = content.find("{")
+    while start != -1:
+        try:
+            return _DECODER.raw_decode(content, start)[0]
+        except json.JSONDecodeError:
+            start = content.find("{", start + 1)
+    return None
+
+
+class MinimaxMoveTable:
+    """Perfect-play Tic Tac Toe moves keyed by symmetry-canonical board
+
+    Boards are (X mask, O mask) pairs canonicalized with bitboard.canonical.
+    Entries map (X mask, O mask, symbol to move) to (score, move index in
+    the canonical frame). With the compiled extension, entries are solved on
+    first lookup instead of being prebuilt.
+    """
+    
+    def __init__(self):
+        self._table: Dict[tuple, tuple] = {}
+        self.compiled = _cminimax is not None
+        # All positions reachable from an empty board, X moving first
+        self._solve(0, 0, "X")
+    
+    def __len__(self):
+        return len(self._table)
+    
+    def _solve(self, x: int, o: int, mover: str) -> int:
+        """Negamax score for the side to move on a canonical (x, o) position"""
+        entry = self._table.get((x, o, mover))
+        if entry is not None:
+            return entry[0]
+        
+        own, theirs = (x, o) if mover == "X" else (o, x)
+        if self.compiled:
+            entry = self._table[(x, o, mover)] = _cminimax.solve(own, theirs)
+            return entry[0]
+        
+        empty = FULL_MASK & ~(x | o)
+        empties = empty.bit_count()
+        won = any(x & mask == mask or o & mask == mask for mask in WIN_MASKS)
+        if won or empties == 0:
+            # Terminal: the previous move won (faster wins score higher) or the board is full
+            score = -(empties + 1) if won else 0
+            self._table[(x, o, mover)] = (score, None)
+            return score
+        
+        opponent = "O" if mover == "X" else "X"
+        best_score, best_move = None, None
+        for i in range(9):
+            cell = 1 << i
+            if not empty & cell:
+                continue
+            child_x, child_o, _ = canonical(x | cell, o) if mover == "X" else canonical(x, o | cell)
+            score = -self._solve(child_x, child_o, opponent)
+            if best_score is None or score > best_score:
+                best_score, best_move = score, i
+        
+        self._table[(x, o, mover)] = (best_score, best_move)
+        return best_score
+    
+    def best_move(self, board: List[List[str]], mover: str) -> Optional[tuple]:
+        """Return the best (row, col) for mover, or None on a finished board"""
+        masks = board_masks(board)
+        x, o, sym = canonical(masks["X"], masks["O"])
+        self._solve(x, o, mover)
+        move = self._table[(x, o, mover)][1]
+        if move is None:
+            return None
+        # Map the canonical-frame cell back onto the caller's board
+        original = INVERSE_TABLES[sym][1 << move].bit_length() - 1
+        return divmod(original, 3)
 
 
 class OptimizedScoutAgent:
     """Optimized Scout Agent - no MCP, shared resources"""
     
+    __slots__ = (
+        "shared_llm", "llm", "agent_id",
+        "_analysis_task", "_threat_detection_task", "_opportunity_detection_task"
+    )
+    
     def __init__(self, shared_llm: SharedLLMConnection):
         self.shared_llm = shared_llm
-        self.llm = shared_llm.get_connection()
+        self.llm = shared_llm.get_batched_connection()
         self.agent_id = "scout"
         
         # Pre-created tasks for warmup
@@ -31,10 +227,11 @@ class OptimizedScoutAgent:
         self._threat_detection_task = None
         self._opportunity_detection_task = None
         
+        _start_log_listener()
         print(f"✅ Optimized Scout Agent initialized (shared LLM)")
     
-    async def warmup(self):
-        """Pre-create tasks during warmup"""
+    async def warmup(self, prime_llm: bool = True):
+        """Pre-create tasks and optionally prime the LLM during warmup"""
         print(f"🔥 Warming up Scout Agent...")
         
         # Pre-create common tasks
@@ -42,112 +239,123 @@ class OptimizedScoutAgent:
         self._threat_detection_task = self._create_threat_detection_task()
         self._opportunity_detection_task = self._create_opportunity_detection_task()
         
-        # Skip LLM warmup to avoid timeouts
-        print(f"✅ Scout Agent warmed up (tasks pre-created)")
+        if prime_llm:
+            await asyncio.gather(
+                _prime(self.llm, self._threat_detection_task, board=_EMPTY_BOARD_JSON),
+                _prime(self.llm, self._opportunity_detection_task, board=_EMPTY_BOARD_JSON)
+            )
+        print(f"✅ Scout Agent warmed up (tasks pre-created{', LLM primed' if prime_llm else ''})")
     
     def _create_analysis_task(self):
         """Pre-create analysis task template"""
-        return {
-            "description": "Analyze Tic Tac Toe board for threats and opportunities",
-            "prompt_template": """Analyze this Tic Tac Toe board: {board}
-Current Player: {current_player}
-Available Moves: {available_moves}
+        return _task(
+            "Analyze Tic Tac Toe board for threats and opportunities",
+            """Analyze the Tic Tac Toe board given by the user.
 
 Provide JSON response with:
 - threats: list of [row, col] where opponent can win
 - opportunities: list of [row, col] where you can win  
 - available_moves: list of [row, col] for empty cells
 
-Example: {{"threats": [[0,2]], "opportunities": [], "available_moves": [[0,0], [0,1], [1,0], [1,1], [1,2], [2,0], [2,1], [2,2]]}}"""
-        }
+Example: {"threats": [[0,2]], "opportunities": [], "available_moves": [[0,0], [0,1], [1,0], [1,1], [1,2], [2,0], [2,1], [2,2]]}""",
+            """Board: {board}
+Current Player: {current_player}
+Available Moves: {available_moves}"""
+        )
     
     def _create_threat_detection_task(self):
         """Pre-create threat detection task template"""
-        return {
-            "description": "Detect immediate threats where opponent can win",
-            "prompt_template": """Check for immediate threats in this board: {board}
+        return _task(
+            "Detect immediate threats where opponent can win",
+            """Check for immediate threats in the Tic Tac Toe board given by the user.
 Look for rows, columns, or diagonals where opponent has 2 in a row.
-Return JSON: {{"threats": [[row, col]]}}"""
-        }
+Return JSON: {"threats": [[row, col]]}""",
+            "Board: {board}"
+        )
     
     def _create_opportunity_detection_task(self):
         """Pre-create opportunity detection task template"""
-        return {
-            "description": "Detect winning opportunities",
-            "prompt_template": """Check for winning opportunities in this board: {board}
+        return _task(
+            "Detect winning opportunities",
+            """Check for winning opportunities in the Tic Tac Toe board given by the user.
 Look for rows, columns, or diagonals where you have 2 in a row.
-Return JSON: {{"opportunities": [[row, col]]}}"""
-        }
+Return JSON: {"opportunities": [[row, col]]}""",
+            "Board: {board}"
+        )
     
     async def analyze_board(self, board_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze board using pre-created task"""
+        """Analyze board with concurrent threat and opportunity detection"""
         start_time = time.time()
         
         try:
-            # Use pre-created task template
-            prompt = self._analysis_task["prompt_template"].format(
-                board=json.dumps(board_state["board"]),
-                current_player=board_state.get("current_player", "O"),
-                available_moves=json.dumps(board_state.get("available_moves", []))
+            # get_ai_move serializes the board once for all three agents
+            board = board_state.get("board_json") or board_json(board_state["board"])
+            
+            # The two detections are independent, so their LLM calls overlap
+            threats, opportunities = await asyncio.gather(
+                self._detect(self._threat_detection_task, board, "threats"),
+                self._detect(self._opportunity_detection_task, board, "opportunities")
             )
             
-            # Direct LLM call with timeout and error handling
-            try:
-                response = await asyncio.wait_for(
-                    self.llm.ainvoke(prompt),
-                    timeout=25.0  # Slightly less than LLM timeout
-                )
-                
-                # Parse response
-                if hasattr(response, 'content'):
-                    content = response.content
-                else:
-                    content = str(response)
-                
-                # Extract JSON from response
-                import re
-                json_match = re.search(r'\{[^}]*\}', content)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback parsing
-                    result = self._fallback_analysis(board_state)
-                    
-            except asyncio.TimeoutError:
-                print(f"⚠️ Scout LLM call timed out, using fallback analysis")
-                result = self._fallback_analysis(board_state)
-            except Exception as e:
-                print(f"⚠️ Scout LLM call failed: {e}, using fallback analysis")
-                result = self._fallback_analysis(board_state)
+            available_moves = board_state.get("available_moves")
+            if available_moves is None:
+                available_moves = self._fallback_analysis(board_state)["available_moves"]
             
             duration = time.time() - start_time
-            print(f"✅ Scout analysis completed in {duration:.3f}s")
+            logger.info("✅ Scout analysis completed in %.3fs", duration)
             
             return {
-                "threats": result.get("threats", []),
-                "opportunities": result.get("opportunities", []),
-                "available_moves": result.get("available_moves", board_state.get("available_moves", [])),
+                "threats": threats,
+                "opportunities": opportunities,
+                "available_moves": available_moves,
                 "analysis_time": duration
             }
             
         except Exception as e:
-            print(f"❌ Scout analysis failed: {e}")
+            logger.error("❌ Scout analysis failed: %s", e)
             return self._fallback_analysis(board_state)
     
+    async def _detect(self, task: Dict[str, Any], board: str, key: str) -> List:
+        """Run one pre-created detection task and return its list of cells"""
+        prompt = _task_messages(task, board=board)
+        
+        # Direct LLM call with timeout and error handling
+        try:
+            response = await asyncio.wait_for(
+                self.llm.ainvoke(prompt),
+                timeout=25.0  # Slightly less than LLM timeout
+            )
+            
+            # Parse response
+            if hasattr(response, 'content'):
+                content = response.content
+            else:
+                content = str(response)
+            
+            # Extract JSON from response
+            result = _extract_json(content)
+            if result is not None:
+                return result.get(key, [])
+            return []
+            
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Scout %s detection timed out, assuming none", key)
+            return []
+        except Exception as e:
+            logger.warning("⚠️ Scout %s detection failed: %s, assuming none", key, e)
+            return []
+    
     def _fallback_analysis(self, board_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback analysis using simple logic"""
+        """Fallback analysis using bitboard line checks"""
         board = board_state["board"]
-        available_moves = []
-        
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == "":
-                    available_moves.append([i, j])
+        player = board_state.get("current_player", "O")
+        opponent = "X" if player == "O" else "O"
+        masks = board_masks(board)
         
         return {
-            "threats": [],
-            "opportunities": [],
-            "available_moves": available_moves
+            "threats": _completing_cells(masks[opponent], masks[""]),
+            "opportunities": _completing_cells(masks[player], masks[""]),
+            "available_moves": _empty_cells(board)
         }
 
 
@@ -156,49 +364,115 @@ class OptimizedStrategistAgent:
     
     def __init__(self, shared_llm: SharedLLMConnection):
         self.shared_llm = shared_llm
-        self.llm = shared_llm.get_connection()
+        self.llm = shared_llm.get_batched_connection()
         self.agent_id = "strategist"
         
         # Pre-created tasks
         self._strategy_task = None
         self._move_recommendation_task = None
+        self._combined_task = None
         
+        _start_log_listener()
         print(f"✅ Optimized Strategist Agent initialized (shared LLM)")
     
-    async def warmup(self):
-        """Pre-create tasks during warmup"""
+    async def warmup(self, prime_llm: bool = True):
+        """Pre-create tasks and optionally prime the LLM during warmup"""
         print(f"🔥 Warming up Strategist Agent...")
         
         # Pre-create common tasks
         self._strategy_task = self._create_strategy_task()
         self._move_recommendation_task = self._create_move_recommendation_task()
+        self._combined_task = self._create_combined_task()
         
-        # Skip LLM warmup to avoid timeouts
-        print(f"✅ Strategist Agent warmed up (tasks pre-created)")
+        if prime_llm:
+            # The coordinator's LLM pipeline runs the combined task, not the strategy task
+            await _prime(self.llm, self._combined_task, board=_EMPTY_BOARD_JSON, available_moves="[]")
+        print(f"✅ Strategist Agent warmed up (tasks pre-created{', LLM primed' if prime_llm else ''})")
     
     def _create_strategy_task(self):
         """Pre-create strategy task template"""
-        return {
-            "description": "Create optimal Tic Tac Toe strategy",
-            "prompt_template": """Create strategy for this Tic Tac Toe situation:
-Board: {board}
-Threats: {threats}
-Opportunities: {opportunities}
-Available Moves: {available_moves}
+        return _task(
+            "Create optimal Tic Tac Toe strategy",
+            """Create strategy for the Tic Tac Toe situation given by the user.
 
 Priority: 1) Win immediately, 2) Block opponent, 3) Center, 4) Corners, 5) Edges
-Return JSON: {{"strategy": "description", "reasoning": "explanation"}}"""
-        }
+Return JSON: {"strategy": "description", "reasoning": "explanation"}""",
+            """Board: {board}
+Threats: {threats}
+Opportunities: {opportunities}
+Available Moves: {available_moves}"""
+        )
     
     def _create_move_recommendation_task(self):
         """Pre-create move recommendation task template"""
-        return {
-            "description": "Recommend best move",
-            "prompt_template": """Recommend best move for this Tic Tac Toe board: {board}
+        return _task(
+            "Recommend best move",
+            """Recommend best move for the Tic Tac Toe board given by the user.
+
+Return JSON: {"move": [row, col], "reasoning": "explanation"}""",
+            """Board: {board}
 Strategy: {strategy}
-Available Moves: {available_moves}
+Available Moves: {available_moves}"""
+        )
+    
+    def _create_combined_task(self):
+        """Pre-create combined board analysis + strategy task template"""
+        return _task(
+            "Analyze Tic Tac Toe board and choose a move in one pass",
+            """You play O in the Tic Tac Toe board given by the user; X is the opponent.
+1. threats: list of [row, col] where X can win next move
+2. opportunities: list of [row, col] where O can win next move
+3. Choose a move. Priority: 1) Win immediately, 2) Block opponent, 3) Center, 4) Corners, 5) Edges
 
-Return JSON: {{"move": [row, col], "reasoning": "explanation"}}"""
+Return JSON: {"threats": [[row, col]], "opportunities": [[row, col]], "strategy": "description", "reasoning": "explanation", "recommended_move": {"row": row, "col": col}}""",
+            """Board: {board}
+Available Moves: {available_moves}"""
+        )
+    
+    async def analyze_and_strategize(self, strategy_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Board analysis and strategy from a single LLM call
+
+        Replaces a scout analyze_board call followed by create_strategy:
+        the strategist's input is fully determined by the board.
+        """
+        start_time = time.time()
+        available_moves = strategy_input.get("available_moves", [])
+        fallback = self._fallback_strategy(strategy_input)
+        
+        try:
+            prompt = _task_messages(
+                self._combined_task,
+                board=strategy_input.get("board_json") or board_json(strategy_input["board_state"]),
+                available_moves=_dumps(available_moves)
+            )
+            response = await asyncio.wait_for(
+                self.llm.ainvoke(prompt),
+                timeout=25.0  # Slightly less than LLM timeout
+            )
+            content = response.content if hasattr(response, 'content') else str(response)
+            result = _extract_json(content) or {}
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Strategist combined LLM call timed out, using fallback strategy")
+            result = {}
+        except Exception as e:
+            logger.warning("⚠️ Strategist combined LLM call failed: %s, using fallback strategy", e)
+            result = {}
+        
+        # Only trust a recommended move that is actually playable
+        move = result.get("recommended_move")
+        if not isinstance(move, dict) or [move.get("row"), move.get("col")] not in available_moves:
+            move = fallback["recommended_move"]
+        
+        duration = time.time() - start_time
+        logger.info("✅ Strategist combined analysis completed in %.3fs", duration)
+        
+        return {
+            "threats": result.get("threats", []),
+            "opportunities": result.get("opportunities", []),
+            "strategy": result.get("strategy", fallback["strategy"]),
+            "reasoning": result.get("reasoning", fallback["reasoning"]),
+            "recommended_move": move,
+            "strategy_time": duration
         }
     
     async def create_strategy(self, strategy_input: Dict[str, Any]) -> Dict[str, Any]:
@@ -207,11 +481,12 @@ Return JSON: {{"move": [row, col], "reasoning": "explanation"}}"""
         
         try:
             # Use pre-created task template
-            prompt = self._strategy_task["prompt_template"].format(
-                board=json.dumps(strategy_input["board_state"]),
-                threats=json.dumps(strategy_input.get("threats", [])),
-                opportunities=json.dumps(strategy_input.get("opportunities", [])),
-                available_moves=json.dumps(strategy_input.get("available_moves", []))
+            prompt = _task_messages(
+                self._strategy_task,
+                board=strategy_input.get("board_json") or board_json(strategy_input["board_state"]),
+                threats=_dumps(strategy_input.get("threats", [])),
+                opportunities=_dumps(strategy_input.get("opportunities", [])),
+                available_moves=_dumps(strategy_input.get("available_moves", []))
             )
             
             # Direct LLM call with timeout and error handling
@@ -228,22 +503,19 @@ Return JSON: {{"move": [row, col], "reasoning": "explanation"}}"""
                     content = str(response)
                 
                 # Extract JSON
-                import re
-                json_match = re.search(r'\{[^}]*\}', content)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
+                result = _extract_json(content)
+                if result is None:
                     result = self._fallback_strategy(strategy_input)
                     
             except asyncio.TimeoutError:
-                print(f"⚠️ Strategist LLM call timed out, using fallback strategy")
+                logger.warning("⚠️ Strategist LLM call timed out, using fallback strategy")
                 result = self._fallback_strategy(strategy_input)
             except Exception as e:
-                print(f"⚠️ Strategist LLM call failed: {e}, using fallback strategy")
+                logger.warning("⚠️ Strategist LLM call failed: %s, using fallback strategy", e)
                 result = self._fallback_strategy(strategy_input)
             
             duration = time.time() - start_time
-            print(f"✅ Strategist strategy completed in {duration:.3f}s")
+            logger.info("✅ Strategist strategy completed in %.3fs", duration)
             
             return {
                 "strategy": result.get("strategy", "Strategic positioning"),
@@ -252,41 +524,41 @@ Return JSON: {{"move": [row, col], "reasoning": "explanation"}}"""
             }
             
         except Exception as e:
-            print(f"❌ Strategist strategy failed: {e}")
+            logger.error("❌ Strategist strategy failed: %s", e)
             return self._fallback_strategy(strategy_input)
     
     def _fallback_strategy(self, strategy_input: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback strategy using simple logic"""
         available_moves = strategy_input.get("available_moves", [])
         
-        # Simple strategy: center first, then corners
-        center = [1, 1]
-        corners = [[0, 0], [0, 2], [2, 0], [2, 2]]
+        # Simple strategy: center first, then corners, from one bitmask of the open cells
+        open_cells = 0
+        for row, col in available_moves:
+            open_cells |= 1 << (3 * row + col)
+        corners = open_cells & CORNER_MASK
         
-        if center in available_moves:
+        if open_cells & CENTER_MASK:
             return {
                 "strategy": "Take center", 
                 "reasoning": "Center control is key",
                 "recommended_move": {"row": 1, "col": 1}
             }
-        elif any(corner in available_moves for corner in corners):
-            # Find first available corner
-            for corner in corners:
-                if corner in available_moves:
-                    return {
-                        "strategy": "Take corner", 
-                        "reasoning": "Corner positioning",
-                        "recommended_move": {"row": corner[0], "col": corner[1]}
-                    }
-        else:
+        elif corners:
+            # Lowest corner bit is the first corner in row-major order
+            row, col = CELLS[(corners & -corners).bit_length() - 1]
+            return {
+                "strategy": "Take corner", 
+                "reasoning": "Corner positioning",
+                "recommended_move": {"row": row, "col": col}
+            }
+        elif available_moves:
             # Take first available move
-            if available_moves:
-                move = available_moves[0]
-                return {
-                    "strategy": "Take any available", 
-                    "reasoning": "Any move is better than none",
-                    "recommended_move": {"row": move[0], "col": move[1]}
-                }
+            move = available_moves[0]
+            return {
+                "strategy": "Take any available", 
+                "reasoning": "Any move is better than none",
+                "recommended_move": {"row": move[0], "col": move[1]}
+            }
         
         # Final fallback
         return {
@@ -301,46 +573,52 @@ class OptimizedExecutorAgent:
     
     def __init__(self, shared_llm: SharedLLMConnection):
         self.shared_llm = shared_llm
-        self.llm = shared_llm.get_connection()
+        self.llm = shared_llm.get_batched_connection()
         self.agent_id = "executor"
         
         # Pre-created tasks
         self._execution_task = None
         self._validation_task = None
         
+        _start_log_listener()
         print(f"✅ Optimized Executor Agent initialized (shared LLM)")
     
-    async def warmup(self):
-        """Pre-create tasks during warmup"""
+    async def warmup(self, prime_llm: bool = True):
+        """Pre-create tasks and optionally prime the LLM during warmup"""
         print(f"🔥 Warming up Executor Agent...")
         
         # Pre-create common tasks
         self._execution_task = self._create_execution_task()
         self._validation_task = self._create_validation_task()
         
-        # Skip LLM warmup to avoid timeouts
-        print(f"✅ Executor Agent warmed up (tasks pre-created)")
+        if prime_llm:
+            await _prime(
+                self.llm, self._execution_task,
+                recommended_move='{"row": 1, "col": 1}', strategy="Take center", board=_EMPTY_BOARD_JSON
+            )
+        print(f"✅ Executor Agent warmed up (tasks pre-created{', LLM primed' if prime_llm else ''})")
     
     def _create_execution_task(self):
         """Pre-create execution task template"""
-        return {
-            "description": "Execute Tic Tac Toe move",
-            "prompt_template": """Execute this Tic Tac Toe move:
-Recommended Move: {recommended_move}
-Strategy: {strategy}
-Board: {board}
+        return _task(
+            "Execute Tic Tac Toe move",
+            """Execute the Tic Tac Toe move given by the user.
 
-Validate the move and return JSON: {{"move": [row, col], "status": "executed", "reasoning": "explanation"}}"""
-        }
+Validate the move and return JSON: {"move": [row, col], "status": "executed", "reasoning": "explanation"}""",
+            """Recommended Move: {recommended_move}
+Strategy: {strategy}
+Board: {board}"""
+        )
     
     def _create_validation_task(self):
         """Pre-create validation task template"""
-        return {
-            "description": "Validate Tic Tac Toe move",
-            "prompt_template": """Validate this Tic Tac Toe move: {move}
-Board: {board}
-Is the move valid? Return JSON: {{"valid": true/false, "reasoning": "explanation"}}"""
-        }
+        return _task(
+            "Validate Tic Tac Toe move",
+            """Validate the Tic Tac Toe move given by the user.
+Is the move valid? Return JSON: {"valid": true/false, "reasoning": "explanation"}""",
+            """Move: {move}
+Board: {board}"""
+        )
     
     async def execute_move(self, execution_input: Dict[str, Any]) -> Dict[str, Any]:
         """Execute move using pre-created task"""
@@ -348,10 +626,11 @@ Is the move valid? Return JSON: {{"valid": true/false, "reasoning": "explanation
         
         try:
             # Use pre-created task template
-            prompt = self._execution_task["prompt_template"].format(
-                recommended_move=json.dumps(execution_input.get("recommended_move", {})),
+            prompt = _task_messages(
+                self._execution_task,
+                recommended_move=_dumps(execution_input.get("recommended_move", {})),
                 strategy=execution_input.get("strategy", "Strategic move"),
-                board=json.dumps(execution_input.get("board", []))
+                board=execution_input.get("board_json") or board_json(execution_input.get("board", []))
             )
             
             # Direct LLM call with timeout and error handling
@@ -368,22 +647,19 @@ Is the move valid? Return JSON: {{"valid": true/false, "reasoning": "explanation
                     content = str(response)
                 
                 # Extract JSON
-                import re
-                json_match = re.search(r'\{[^}]*\}', content)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
+                result = _extract_json(content)
+                if result is None:
                     result = self._fallback_execution(execution_input)
                     
             except asyncio.TimeoutError:
-                print(f"⚠️ Executor LLM call timed out, using fallback execution")
+                logger.warning("⚠️ Executor LLM call timed out, using fallback execution")
                 result = self._fallback_execution(execution_input)
             except Exception as e:
-                print(f"⚠️ Executor LLM call failed: {e}, using fallback execution")
+                logger.warning("⚠️ Executor LLM call failed: %s, using fallback execution", e)
                 result = self._fallback_execution(execution_input)
             
             duration = time.time() - start_time
-            print(f"✅ Executor move completed in {duration:.3f}s")
+            logger.info("✅ Executor move completed in %.3fs", duration)
             
             return {
                 "move": result.get("move", execution_input.get("recommended_move", {})),
@@ -393,7 +669,7 @@ Is the move valid? Return JSON: {{"valid": true/false, "reasoning": "explanation
             }
             
         except Exception as e:
-            print(f"❌ Executor move failed: {e}")
+            logger.error("❌ Executor move failed: %s", e)
             return self._fallback_execution(execution_input)
     
     def _fallback_execution(self, execution_input: Dict[str, Any]) -> Dict[str, Any]:
@@ -418,7 +694,12 @@ Is the move valid? Return JSON: {{"valid": true/false, "reasoning": "explanation
 class OptimizedLocalCoordinator:
     """Optimized coordinator for true local mode"""
     
-    def __init__(self, model_name: str = "llama3.2:1b"):
+    def __init__(self, model_name: str = "llama3.2:1b", use_llm_pipeline: bool = False):
+        # Tic Tac Toe is small enough to solve exactly; the LLM pipeline is kept
+        # behind use_llm_pipeline for comparison runs
+        self.use_llm_pipeline = use_llm_pipeline
+        self.move_table = MinimaxMoveTable()
+        
         # Create shared LLM connection
         self.shared_llm = SharedLLMConnection(model_name)
         
@@ -432,17 +713,20 @@ class OptimizedLocalCoordinator:
         print(f"   • No MCP servers")
         print(f"   • No async coordination")
         print(f"   • Direct method calls only")
+        solver = "compiled" if self.move_table.compiled else f"{len(self.move_table)} positions"
+        print(f"   • Minimax table: {solver} (LLM pipeline {'on' if use_llm_pipeline else 'off'})")
     
     async def warmup(self):
         """Comprehensive warmup of all agents"""
         print(f"🔥 Starting comprehensive warmup...")
         start_time = time.time()
         
-        # Warm up all agents in parallel
+        # Warm up all agents in parallel; the LLM is only primed when moves use it
         await asyncio.gather(
-            self.scout.warmup(),
-            self.strategist.warmup(),
-            self.executor.warmup()
+            # Moves go through the strategist's combined task, so the scout is not primed
+            self.scout.warmup(False),
+            self.strategist.warmup(self.use_llm_pipeline),
+            self.executor.warmup(self.use_llm_pipeline)
         )
         
         # Test full coordination flow
@@ -465,32 +749,41 @@ class OptimizedLocalCoordinator:
         
         try:
             # Get available moves
-            available_moves = []
             board = board_state["board"]
-            for i in range(3):
-                for j in range(3):
-                    if board[i][j] == "":
-                        available_moves.append([i, j])
+            available_moves = _empty_cells(board)
             
             if not available_moves:
                 return {"error": "No available moves"}
             
-            # Scout analysis
-            scout_input = {
-                "board": board,
-                "available_moves": available_moves,
-                "current_player": "O"
-            }
-            scout_result = await self.scout.analyze_board(scout_input)
+            if not self.use_llm_pipeline:
+                best = self.move_table.best_move(board, "O")
+                if best is None:
+                    return {"error": "Game is already over"}
+                total_time = time.time() - start_time
+                return {
+                    "success": True,
+                    "move": {"row": best[0], "col": best[1]},
+                    "process": {
+                        "move_table": "minimax",
+                        "total_time": total_time,
+                        "optimized": True
+                    }
+                }
+            
+            encoded_board = board_json(board)
             
-            # Strategist strategy
+            # Scout analysis and strategy fused into one LLM call
             strategist_input = {
                 "board_state": board,
-                "available_moves": scout_result.get("available_moves", available_moves),
-                "threats": scout_result.get("threats", []),
-                "opportunities": scout_result.get("opportunities", [])
+                "board_json": encoded_board,
+                "available_moves": available_moves
+            }
+            strategist_result = await self.strategist.analyze_and_strategize(strategist_input)
+            scout_result = {
+                "threats": strategist_result["threats"],
+                "opportunities": strategist_result["opportunities"],
+                "available_moves": available_moves
             }
-            strategist_result = await self.strategist.create_strategy(strategist_input)
             
             # Extract recommended move from strategist
             strategist_move = strategist_result.get("recommended_move", {})
@@ -505,16 +798,17 @@ class OptimizedLocalCoordinator:
             executor_input = {
                 "recommended_move": strategist_move,
                 "strategy": strategist_result.get("strategy", ""),
-                "board": board
+                "board": board,
+                "board_json": encoded_board
             }
             executor_result = await self.executor.execute_move(executor_input)
             
             total_time = time.time() - start_time
-            print(f"✅ Optimized AI move completed in {total_time:.3f}s")
+            logger.info("✅ Optimized AI move completed in %.3fs", total_time)
             
             # Debug: Print the actual move being returned
             final_move = executor_result.get("move", {})
-            print(f"[DEBUG] Final move being returned: {final_move}")
+            logger.debug("[DEBUG] Final move being returned: %s", final_move)
             
             return {
                 "success": True,
@@ -529,7 +823,7 @@ class OptimizedLocalCoordinator:
             }
             
         except Exception as e:
-            print(f"❌ Optimized AI move failed: {e}")
+            logger.error("❌ Optimized AI move failed: %s", e)
             return {"error": f"AI move failed: {e}"}
     
     def cleanup(self):
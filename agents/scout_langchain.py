@@ -3,14 +3,27 @@ LangChain-based Scout Agent for Tic-Tac-Toe
 Replaces CrewAI Scout with direct LangChain implementation
 """
 
-import json
 import asyncio
-from typing import Dict, List, Any, Optional
+import logging
+import time
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
 from langchain.schema import HumanMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_openai import ChatOpenAI
+import orjson
 from pydantic import BaseModel, Field
 from models.shared_llm import SharedLLMConnection
+from game import bitboard
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a prompt fragment to compact JSON text"""
+    return orjson.dumps(value).decode()
 
 
 class BoardAnalysis(BaseModel):
@@ -21,17 +34,47 @@ class BoardAnalysis(BaseModel):
     analysis: str = Field(description="Detailed analysis of the board state")
 
 
+# Schema, prompt and instructions depend only on BoardAnalysis, so they are built once per process
+_PARSER = PydanticOutputParser(pydantic_object=BoardAnalysis)
+_FORMAT_INSTRUCTIONS = _PARSER.get_format_instructions()
+_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a Tic-Tac-Toe board analysis expert. Your job is to analyze the current board state and identify:
+1. IMMEDIATE THREATS: Positions where the opponent can win in their next move
+2. WINNING OPPORTUNITIES: Positions where we can win in our next move
+3. STRATEGIC MOVES: Best positions for center control, corner control, etc.
+
+Analyze the board and provide structured output with threats, opportunities, and strategic moves.
+{format_instructions}"""),
+    ("human", """Analyze this Tic-Tac-Toe board:
+Board: {board}
+Current Player: {current_player}
+Available Moves: {available_moves}
+
+Provide your analysis:""")
+])
+
+
 class ScoutLangChain:
     """LangChain-based Scout agent for board analysis"""
 
-    def __init__(self, shared_llm: Optional[SharedLLMConnection] = None, model_name: str = "gpt-5-mini"):
+    __slots__ = (
+        "use_llm", "analysis_cache", "shared_llm", "llm", "model_name",
+        "stream_parser", "chain", "chain_instructions"
+    )
+
+    def __init__(self, shared_llm: Optional[SharedLLMConnection] = None, model_name: str = "gpt-5-mini",
+                 use_llm: bool = False):
         """
         Initialize Scout agent
 
         Args:
             shared_llm: Optional SharedLLMConnection instance. If provided, uses shared connection.
             model_name: Model name (only used if shared_llm is None)
+            use_llm: Ask the LLM for the analysis instead of the bitboard evaluator
         """
+        self.use_llm = use_llm
+        # Parsed LLM analyses by model, player and board, so repeat states skip the round trip
+        self.analysis_cache = bitboard.BoardCache()
         if shared_llm:
             self.shared_llm = shared_llm
             self.llm = shared_llm.get_connection()
@@ -44,57 +87,69 @@ class ScoutLangChain:
             self.model_name = model_name
             print(f"⚠️ ScoutLangChain creating own LLM connection: {self.model_name}")
 
-        self.parser = PydanticOutputParser(pydantic_object=BoardAnalysis)
+        structured_llm = self._structured_llm()
+        # Yields partial dicts while the response streams; see stream_analysis
+        self.stream_parser = JsonOutputParser()
 
-        # Create the prompt template
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a Tic-Tac-Toe board analysis expert. Your job is to analyze the current board state and identify:
-1. IMMEDIATE THREATS: Positions where the opponent can win in their next move
-2. WINNING OPPORTUNITIES: Positions where we can win in our next move
-3. STRATEGIC MOVES: Best positions for center control, corner control, etc.
+        if structured_llm is not None:
+            # The API enforces the schema, so the prompt drops the format instructions
+            self.chain = _PROMPT | structured_llm
+            self.chain_instructions = ""
+        else:
+            self.chain = _PROMPT | self.llm | _PARSER
+            self.chain_instructions = _FORMAT_INSTRUCTIONS
 
-Analyze the board and provide structured output with threats, opportunities, and strategic moves.
-{format_instructions}"""),
-            ("human", """Analyze this Tic-Tac-Toe board:
-Board: {board}
-Current Player: {current_player}
-Available Moves: {available_moves}
+    def _structured_llm(self):
+        """The LLM bound to BoardAnalysis via native structured output, or None
 
-Provide your analysis:""")
-        ])
+        Chat models return a validated BoardAnalysis directly; plain completion
+        models (Ollama) keep the format-instructions prompt and output parser.
+        """
+        if not isinstance(self.llm, BaseChatModel):
+            return None
+        try:
+            if isinstance(self.llm, ChatOpenAI):
+                return self.llm.with_structured_output(BoardAnalysis, method="json_schema")
+            return self.llm.with_structured_output(BoardAnalysis)
+        except NotImplementedError:
+            return None
     
     async def analyze_board(self, board_state: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the board and return structured analysis"""
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            print(f"[DEBUG] ScoutLangChain: Starting board analysis")
-            
             # Prepare the input
             board = board_state.get("board", [])
             current_player = board_state.get("current_player", "O")
             available_moves = board_state.get("available_moves", [])
             
-            # Create the chain
-            chain = self.prompt | self.llm | self.parser
+            if not self.use_llm:
+                return self._analyze_bitboard(board, available_moves)
+            
+            # The reply depends on the model and the side to move as well as the board
+            key = f"{self.model_name}|{current_player}|{bitboard.board_key(board)}"
+            cached = self.analysis_cache.get(key)
+            if cached is not None:
+                # Callers annotate the result in place; keep the cached entry untouched
+                return dict(cached)
             
             # Make the call
-            llm_start = time.time()
-            result = await chain.ainvoke({
-                "board": json.dumps(board),
+            llm_start = time.perf_counter()
+            result = await self.chain.ainvoke({
+                "board": bitboard.board_json(board),
                 "current_player": current_player,
-                "available_moves": json.dumps(available_moves),
-                "format_instructions": self.parser.get_format_instructions()
+                "available_moves": _dumps(available_moves),
+                "format_instructions": self.chain_instructions
             })
-            llm_duration = time.time() - llm_start
+            llm_duration = time.perf_counter() - llm_start
             
-            total_duration = time.time() - start_time
+            total_duration = time.perf_counter() - start_time
             overhead = total_duration - llm_duration
-            print(f"[DEBUG] ScoutLangChain: Analysis completed successfully")
-            print(f"[TIMING] Scout Agent - LLM: {llm_duration:.3f}s, Overhead: {overhead:.3f}s, Total: {total_duration:.3f}s")
+            logger.debug("Scout Agent - LLM: %.3fs, Overhead: %.3fs, Total: %.3fs",
+                         llm_duration, overhead, total_duration)
             
-            return {
+            analysis = {
                 "success": True,
                 "threats": result.threats,
                 "opportunities": result.opportunities,
@@ -102,11 +157,12 @@ Provide your analysis:""")
                 "analysis": result.analysis,
                 "available_moves": available_moves
             }
+            self.analysis_cache.put(key, analysis)
+            return dict(analysis)
             
         except Exception as e:
-            total_duration = time.time() - start_time
-            print(f"[DEBUG] ScoutLangChain: Analysis failed: {e}")
-            print(f"[TIMING] Scout Agent - FAILED after {total_duration:.3f}s")
+            total_duration = time.perf_counter() - start_time
+            logger.debug("ScoutLangChain: Analysis failed after %.3fs: %s", total_duration, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -117,6 +173,61 @@ Provide your analysis:""")
                 "available_moves": board_state.get("available_moves", [])
             }
     
+    def _analyze_bitboard(self, board: List[List[str]], available_moves: List) -> Dict[str, Any]:
+        """Deterministic analysis: win/block cells, then forks, center and corners"""
+        analysis = bitboard.cached_analysis(board)
+        strategic_moves = list(analysis["forks"])
+        if analysis["center_available"]:
+            strategic_moves.append({"row": 1, "col": 1})
+        strategic_moves.extend(analysis["corners_available"])
+        
+        return {
+            "success": True,
+            "threats": analysis["threats"],
+            "opportunities": analysis["opportunities"],
+            "strategic_moves": strategic_moves,
+            "analysis": bitboard.summarize(analysis),
+            "available_moves": available_moves or analysis["available_moves"]
+        }
+    
+    async def stream_analysis(self, board_state: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (field, value) for each analysis field as soon as it is complete
+
+        The LLM answers in BoardAnalysis field order (threats first), so callers
+        can act on threats while strategic_moves and analysis are still being
+        generated. A field is complete once the next field has started, or when
+        the stream ends.
+        """
+        board = board_state.get("board", [])
+        available_moves = board_state.get("available_moves", [])
+        
+        if not self.use_llm:
+            for field, value in self._analyze_bitboard(board, available_moves).items():
+                yield field, value
+            return
+        
+        chain = _PROMPT | self.llm | self.stream_parser
+        emitted = set()
+        latest: Dict[str, Any] = {}
+        async for partial in chain.astream({
+            "board": bitboard.board_json(board),
+            "current_player": board_state.get("current_player", "O"),
+            "available_moves": _dumps(available_moves),
+            "format_instructions": _FORMAT_INSTRUCTIONS
+        }):
+            if not isinstance(partial, dict):
+                continue
+            # Every field before the one currently streaming is closed
+            for field in list(partial)[:-1]:
+                if field not in emitted:
+                    emitted.add(field)
+                    yield field, partial[field]
+            latest = partial
+        
+        for field, value in latest.items():
+            if field not in emitted:
+                yield field, value
+    
     async def detect_threats(self, board_state: Dict[str, Any]) -> List[Dict[str, int]]:
         """Detect immediate threats on the board"""
         analysis = await self.analyze_board(board_state)
@@ -3,13 +3,57 @@ Scout MCP Agent Module
 Scout agent with MCP capabilities for distributed communication
 """
 from .base_mcp_agent import BaseMCPAgent
-from crewai import Task
-from typing import Dict, List
-import json
+from typing import Any, Dict, List, Optional
 import asyncio
-from datetime import datetime
+import os
+import shelve
+import threading
+import time
+from pydantic import BaseModel, ValidationError
 from models.factory import ModelFactory
 from utils.config import config
+from game import bitboard
+
+# Response timestamps are monotonic nanoseconds; they only order and time agent replies
+_now = time.monotonic_ns
+
+
+# Fixed instructions lead and per-call values trail, so every call shares a
+# prompt prefix; lines carry no source indentation (it would be sent as tokens)
+ANALYSIS_PROMPT = """CRITICAL Tic Tac Toe board analysis.
+
+URGENT PRIORITIES:
+1. THREAT DETECTION: Check if opponent (X) has 2 in a row - BLOCK immediately!
+2. WIN OPPORTUNITIES: Check if AI (O) has 2 in a row - WIN immediately!
+3. STRATEGIC ANALYSIS: Center control, corner positions, fork opportunities
+
+REQUIRED ANALYSIS:
+- Scan all rows, columns, and diagonals for threats
+- Identify any immediate blocking moves needed
+- Identify any winning moves available
+- Assess strategic positioning opportunities and the game phase
+
+Respond with only a JSON object:
+{{"analysis": "<reasoning and recommendations>",
+"threats": [{{"row": r, "col": c}}, ...],
+"opportunities": [{{"row": r, "col": c}}, ...],
+"patterns": "<patterns and strategic themes>",
+"available_moves": [{{"row": r, "col": c}}, ...]}}
+
+The board is 9 characters, row by row from the top-left: X, O, or . for empty (index = 3 * row + col).
+
+Board: {board}
+Current Player: {current_player}
+Move Number: {move_number}"""
+
+
+class ScoutLLMAnalysis(BaseModel):
+    """Combined scout analysis parsed from one LLM response"""
+    analysis: str = ""
+    threats: List[Any] = []
+    opportunities: List[Any] = []
+    patterns: str = ""
+    available_moves: List[Any] = []
 
 
 class ScoutMCPAgent(BaseMCPAgent):
@@ -31,6 +75,17 @@ class ScoutMCPAgent(BaseMCPAgent):
             agent_id="scout",
             llm=llm
         )
+        # Board analysis is computed from bitboards; the LLM is only consulted when asked
+        self.__dict__['use_llm_analysis'] = model_config.get("use_llm_analysis", False)
+        # Per-board LLM results, shared by every handler and repeat query
+        self.__dict__['llm_analysis_cache'] = bitboard.BoardCache()
+        # Boards with an LLM analysis in flight, so concurrent handlers share one call
+        self.__dict__['llm_analysis_inflight'] = {}
+        # Opt-in on-disk copy of the LLM results (SCOUT_ANALYSIS_CACHE=<path>) so they survive restarts
+        store_path = os.getenv("SCOUT_ANALYSIS_CACHE")
+        self.__dict__['llm_analysis_store'] = shelve.open(store_path) if store_path else None
+        # Store reads and writes run in worker threads; dbm handles are not thread-safe
+        self.__dict__['llm_analysis_store_lock'] = threading.Lock()
     
     def register_agent_specific_endpoints(self):
         """Register Scout-specific MCP tools with proper schemas"""
@@ -52,6 +107,10 @@ class ScoutMCPAgent(BaseMCPAgent):
                     "move_number": {
                         "type": "integer",
                         "description": "Current move number"
+                    },
+                    "narrative": {
+                        "type": "boolean",
+                        "description": "Ask the LLM for a written analysis"
                     }
                 },
                 "required": ["board"]
@@ -104,6 +163,38 @@ class ScoutMCPAgent(BaseMCPAgent):
                     "move_history": {
                         "type": "array",
                         "description": "History of moves played"
+                    },
+                    "narrative": {
+                        "type": "boolean",
+                        "description": "Ask the LLM for a written pattern analysis"
+                    }
+                },
+                "required": ["board"]
+            }
+        )
+        
+        self.register_mcp_tool(
+            "analyze",
+            self.analyze,
+            "Threats, winning moves, patterns, available moves and a recommended move in one call",
+            {
+                "type": "object",
+                "properties": {
+                    "board": {
+                        "type": "array",
+                        "description": "3x3 game board"
+                    },
+                    "current_player": {
+                        "type": "string",
+                        "description": "Current player (player or ai)"
+                    },
+                    "move_number": {
+                        "type": "integer",
+                        "description": "Current move number"
+                    },
+                    "narrative": {
+                        "type": "boolean",
+                        "description": "Ask the LLM for a written pattern analysis"
                     }
                 },
                 "required": ["board"]
@@ -117,69 +208,25 @@ class ScoutMCPAgent(BaseMCPAgent):
             current_player = board_data.get("current_player", "ai")
             move_number = board_data.get("move_number", 0)
             
-            # Create analysis task for CrewAI
-            analysis_task = Task(
-                description=f"""
-                CRITICAL Tic Tac Toe board analysis:
-                Board: {json.dumps(board_state)}
-                Current Player: {current_player}
-                Move Number: {move_number}
-                
-                URGENT PRIORITIES:
-                1. THREAT DETECTION: Check if opponent (X) has 2 in a row - BLOCK immediately!
-                2. WIN OPPORTUNITIES: Check if AI (O) has 2 in a row - WIN immediately!
-                3. STRATEGIC ANALYSIS: Center control, corner positions, fork opportunities
-                
-                REQUIRED ANALYSIS:
-                - Scan all rows, columns, and diagonals for threats
-                - Identify any immediate blocking moves needed
-                - Identify any winning moves available
-                - Assess strategic positioning opportunities
-                - Provide clear recommendations with reasoning
-                """,
-                expected_output="Structured analysis with immediate threats, blocking moves, winning opportunities, and strategic recommendations"
-            )
-            
-            # Execute analysis using CrewAI with timeout
-            try:
-                print(f"[DEBUG] Scout: Starting CrewAI execution")
-                # Use the CrewAI agent's execute method with timeout
-                analysis_result = await asyncio.wait_for(
-                    self.execute(analysis_task), 
-                    timeout=15.0  # Increased timeout for LLM calls
-                )
-                print(f"[DEBUG] Scout: CrewAI execution completed")
-            except Exception as e:
-                print(f"[DEBUG] Scout: CrewAI execution failed with exception: {type(e).__name__}: {str(e)}")
-                print(f"[DEBUG] Scout: Exception details: {repr(e)}")
-                # Fallback: use the LLM directly with optimized prompt
-                short_prompt = f"""Analyze this Tic Tac Toe board: {json.dumps(board_state)}
-Current player: {current_player}
-
-CRITICAL ANALYSIS REQUIRED:
-1. THREAT DETECTION: Look for opponent (X) having 2 in a row - this is URGENT to block!
-2. WIN OPPORTUNITIES: Look for AI (O) having 2 in a row - this is a winning move!
-3. STRATEGIC POSITIONING: Center and corners are valuable
-
-BOARD ANALYSIS:
-- Check all rows, columns, and diagonals for threats
-- Identify any immediate blocking moves needed
-- Identify any winning moves available
-
-Provide concise analysis focusing on immediate threats and opportunities."""
-                analysis_result = await self._tracked_llm_call(short_prompt)
-                print(f"[DEBUG] Scout: LLM fallback completed")
+            analysis = bitboard.cached_analysis(board_state)
+            if self._wants_llm(board_data, analysis):
+                analysis_result = (await self._analyze_all(board_state, current_player, move_number)).analysis
+            else:
+                analysis_result = bitboard.summarize(analysis)
             
             # Structure the response for MCP protocol
             return {
                 "agent_id": "scout",
                 "board_state": board_state,
                 "analysis": analysis_result,
-                "available_moves": self.get_available_moves(board_state),
-                "threats": self.extract_threats(analysis_result),
-                "opportunities": self.extract_opportunities(analysis_result),
-                "confidence": 0.85,
-                "timestamp": datetime.now().isoformat()
+                "available_moves": analysis["available_moves"],
+                "threats": analysis["threats"],
+                "opportunities": analysis["opportunities"],
+                "forks": analysis["forks"],
+                "opponent_forks": analysis["opponent_forks"],
+                "game_phase": analysis["game_phase"],
+                "confidence": 1.0,
+                "timestamp_ns": _now()
             }
             
         except Exception as e:
@@ -187,75 +234,195 @@ Provide concise analysis focusing on immediate threats and opportunities."""
     
     async def detect_threats(self, board_data: Dict) -> Dict:
         """Detect immediate threats on the board"""
-        # Use CrewAI's capabilities for threat detection
-        threat_task = Task(
-            description=f"Identify immediate threats in board: {board_data.get('board')}",
-            expected_output="List of immediate threats and blocking moves"
-        )
-        
-        result = await asyncio.to_thread(self.execute, threat_task)
+        threats = self.extract_threats(board_data.get("board", []))
         
         return {
             "agent_id": "scout",
-            "threats": result,
-            "critical_moves": [],  # Extract from result
-            "timestamp": datetime.now().isoformat()
+            "threats": threats,
+            "critical_moves": threats,
+            "timestamp_ns": _now()
         }
     
     async def identify_opportunities(self, board_data: Dict) -> Dict:
         """Identify winning opportunities"""
-        opportunity_task = Task(
-            description=f"Identify winning opportunities in board: {board_data.get('board')}",
-            expected_output="List of winning opportunities and strategic moves"
-        )
-        
-        result = await asyncio.to_thread(self.execute, opportunity_task)
+        opportunities = self.extract_opportunities(board_data.get("board", []))
         
         return {
             "agent_id": "scout",
-            "opportunities": result,
-            "winning_moves": [],  # Extract from result
-            "timestamp": datetime.now().isoformat()
+            "opportunities": opportunities,
+            "winning_moves": opportunities,
+            "timestamp_ns": _now()
         }
     
     async def get_pattern_analysis(self, board_data: Dict) -> Dict:
-        """Analyze patterns in the game"""
-        pattern_task = Task(
-            description=f"Analyze patterns and game phase in board: {board_data.get('board')}",
-            expected_output="Pattern analysis including game phase, strategic themes, and player tendencies"
-        )
+        """Analyze patterns in the game (the patterns slice of analyze)"""
+        full = await self.analyze(board_data)
         
-        result = await asyncio.to_thread(self.execute, pattern_task)
+        return {
+            "agent_id": "scout",
+            "patterns": full["patterns"],
+            "game_phase": full["game_phase"],
+            "timestamp_ns": full["timestamp_ns"]
+        }
+    
+    async def analyze(self, board_data: Dict) -> Dict:
+        """Everything the scout tools report for a board, from one analysis
+
+        detect_threats, identify_opportunities and get_pattern_analysis each
+        return a slice of this; clients needing several should call it once.
+        """
+        board_state = board_data.get("board", [])
+        analysis = bitboard.cached_analysis(board_state)
+        patterns = bitboard.summarize(analysis)
+        if self._wants_llm(board_data, analysis):
+            patterns = (await self._analyze_all(
+                board_state, board_data.get("current_player", "ai"), board_data.get("move_number", 0)
+            )).patterns
         
         return {
             "agent_id": "scout",
-            "patterns": result,
-            "game_phase": "midgame",  # Extract from result
-            "timestamp": datetime.now().isoformat()
+            "threats": analysis["threats"],
+            "opportunities": analysis["opportunities"],
+            "patterns": patterns,
+            "available_moves": analysis["available_moves"],
+            "recommended_move": bitboard.recommend_move(analysis),
+            "game_phase": analysis["game_phase"],
+            "timestamp_ns": _now()
         }
     
+    def _wants_llm(self, board_data: Dict, analysis: Dict) -> bool:
+        """Whether a handler should ask the LLM for its narrative text
+
+        Callers can request it per call with "narrative". Otherwise, with
+        use_llm_analysis set, only undecided midgame positions go to the LLM:
+        openings and boards with a win or block are settled by the bitboard.
+        """
+        if board_data.get("narrative"):
+            return True
+        if not self.__dict__.get('use_llm_analysis'):
+            return False
+        return analysis["game_phase"] == "midgame" and not analysis["threats"] and not analysis["opportunities"]
+    
+    async def _analyze_all(self, board_state: List[List[str]], current_player: str = "ai",
+                           move_number: int = 0) -> ScoutLLMAnalysis:
+        """One LLM call for all four scout fields, cached per board
+
+        Handlers called concurrently for the same board (e.g. detect_threats and
+        identify_opportunities in one tools/call_many) await the same call.
+        """
+        cache = self.__dict__['llm_analysis_cache']
+        # Replies differ by model and side to move, so both are part of the key
+        key = f"{self.__dict__.get('current_model')}|{current_player}|{bitboard.board_key(board_state)}"
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if self.__dict__['llm_analysis_store'] is not None:
+            stored = await asyncio.to_thread(self._store_get, key)
+            if stored is not None:
+                cached = ScoutLLMAnalysis.model_validate_json(stored)
+                cache.put(key, cached)
+                return cached
+        
+        inflight = self.__dict__['llm_analysis_inflight']
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_analysis(key, board_state, current_player, move_number))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # Shield so one caller timing out does not cancel the others' call
+        return await asyncio.shield(task)
+    
+    async def _fetch_analysis(self, key: str, board_state: List[List[str]], current_player: str,
+                              move_number: int) -> ScoutLLMAnalysis:
+        """Run the combined LLM analysis for one board and cache a parsed reply
+
+        The response is parsed in two stages: extract the JSON object from the
+        free-form reply, then validate it into ScoutLLMAnalysis. Replies that do
+        not parse keep their text as the analysis and take threats,
+        opportunities and moves from the bitboard evaluator; they are not
+        cached, so the next request for the board asks again.
+        """
+        prompt = ANALYSIS_PROMPT.format(board=bitboard.board_key(board_state), current_player=current_player,
+                                        move_number=move_number)
+        try:
+            raw = await asyncio.wait_for(self._tracked_llm_call(prompt), timeout=15.0)
+        except Exception as e:
+            self.__dict__['logger'].debug("Scout LLM analysis failed: %s: %s", type(e).__name__, e)
+            raw = None
+        
+        text = str(raw) if raw is not None else ""
+        result = self._parse_reply(text)
+        if result is None:
+            return self._fallback_analysis(text, board_state)
+        
+        self.__dict__['llm_analysis_cache'].put(key, result)
+        if self.__dict__['llm_analysis_store'] is not None:
+            await asyncio.to_thread(self._store_put, key, result.model_dump_json())
+        return result
+    
+    async def aclose(self):
+        """Flush and close the on-disk analysis store, if one is open; call at shutdown"""
+        if self.__dict__['llm_analysis_store'] is not None:
+            await asyncio.to_thread(self._store_close)
+    
+    def _store_close(self):
+        """Close the store under its lock so no in-flight write is cut short (runs in a worker thread)"""
+        with self.__dict__['llm_analysis_store_lock']:
+            store = self.__dict__['llm_analysis_store']
+            self.__dict__['llm_analysis_store'] = None
+            if store is not None:
+                store.close()
+    
+    def _store_get(self, key: str) -> Optional[str]:
+        """Persisted analysis JSON for key, or None (runs in a worker thread)"""
+        with self.__dict__['llm_analysis_store_lock']:
+            store = self.__dict__['llm_analysis_store']
+            return store.get(key) if store is not None else None
+    
+    def _store_put(self, key: str, value: str):
+        """Persist one analysis and flush it to disk (runs in a worker thread)"""
+        with self.__dict__['llm_analysis_store_lock']:
+            store = self.__dict__['llm_analysis_store']
+            # Closed at shutdown while this reply was in flight
+            if store is not None:
+                store[key] = value
+                store.sync()
+    
+    @staticmethod
+    def _parse_reply(text: str) -> Optional[ScoutLLMAnalysis]:
+        """The ScoutLLMAnalysis in an LLM reply, or None if it does not parse"""
+        start, end = text.find("{"), text.rfind("}")
+        if start != -1 and end > start:
+            try:
+                return ScoutLLMAnalysis.model_validate_json(text[start:end + 1])
+            except ValidationError:
+                pass
+        return None
+    
+    def _fallback_analysis(self, text: str, board_state: List[List[str]]) -> ScoutLLMAnalysis:
+        """Bitboard analysis standing in for an LLM reply that did not parse"""
+        analysis = bitboard.cached_analysis(board_state)
+        return ScoutLLMAnalysis(
+            analysis=text or bitboard.summarize(analysis),
+            threats=analysis["threats"],
+            opportunities=analysis["opportunities"],
+            patterns=bitboard.summarize(analysis),
+            available_moves=analysis["available_moves"]
+        )
+    
     def get_available_moves(self, board_state: List[List[str]]) -> List[Dict]:
         """Get available moves from board state"""
-        available = []
-        for row in range(3):
-            for col in range(3):
-                if board_state[row][col] == "":
-                    available.append({"row": row, "col": col})
-        return available
+        return bitboard.mask_cells(bitboard.empty_mask(board_state))
     
-    def extract_threats(self, analysis_result: str) -> List[str]:
-        """Extract threats from analysis result"""
-        # TODO: Implement proper parsing of CrewAI result
-        # For now, return mock data
-        return ["Opponent has two in a row", "Need to block center threat"]
+    def extract_threats(self, board_state: List[List[str]]) -> List[Dict]:
+        """Cells where the opponent (X) wins next move and must be blocked"""
+        return bitboard.cached_analysis(board_state)["threats"]
     
-    def extract_opportunities(self, analysis_result: str) -> List[str]:
-        """Extract opportunities from analysis result"""
-        # TODO: Implement proper parsing of CrewAI result
-        # For now, return mock data
-        return ["Can create fork", "Center control available"]
+    def extract_opportunities(self, board_state: List[List[str]]) -> List[Dict]:
+        """Cells where the AI (O) wins immediately"""
+        return bitboard.cached_analysis(board_state)["opportunities"]
     
     def create_llm(self, model_config: Dict):
-        """Create LLM instance based on config"""
+        """Create LLM instance based on config (shared per model by ModelFactory)"""
         model_name = model_config.get("model", "gpt-4")
         return ModelFactory.create_llm(model_name)
@@ -3,14 +3,19 @@ LangChain-based Strategist Agent for Tic-Tac-Toe
 Replaces CrewAI Strategist with direct LangChain implementation
 """
 
-import json
 import asyncio
+import logging
+import time
 from typing import Dict, List, Any, Optional
 from langchain.schema import HumanMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from models.shared_llm import SharedLLMConnection
+from game import bitboard
+import orjson
+
+logger = logging.getLogger(__name__)
 
 
 class StrategyRecommendation(BaseModel):
@@ -69,12 +74,9 @@ Recommend the best move:""")
     
     async def create_strategy(self, strategy_input: Dict[str, Any]) -> Dict[str, Any]:
         """Create strategy based on board analysis"""
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            print(f"[DEBUG] StrategistLangChain: Starting strategy creation")
-            
             # Prepare the input
             board = strategy_input.get("board_state", [])
             threats = strategy_input.get("threats", [])
@@ -86,21 +88,21 @@ Recommend the best move:""")
             chain = self.prompt | self.llm | self.parser
             
             # Make the call
-            llm_start = time.time()
+            llm_start = time.perf_counter()
             result = await chain.ainvoke({
-                "board": json.dumps(board),
-                "threats": json.dumps(threats),
-                "opportunities": json.dumps(opportunities),
-                "available_moves": json.dumps(available_moves),
+                "board": bitboard.board_json(board),
+                "threats": orjson.dumps(threats).decode(),
+                "opportunities": orjson.dumps(opportunities).decode(),
+                "available_moves": orjson.dumps(available_moves).decode(),
                 "current_player": current_player,
                 "format_instructions": self.parser.get_format_instructions()
             })
-            llm_duration = time.time() - llm_start
+            llm_duration = time.perf_counter() - llm_start
             
-            total_duration = time.time() - start_time
+            total_duration = time.perf_counter() - start_time
             overhead = total_duration - llm_duration
-            print(f"[DEBUG] StrategistLangChain: Strategy created successfully")
-            print(f"[TIMING] Strategist Agent - LLM: {llm_duration:.3f}s, Overhead: {overhead:.3f}s, Total: {total_duration:.3f}s")
+            logger.debug("Strategist Agent - LLM: %.3fs, Overhead: %.3fs, Total: %.3fs",
+                         llm_duration, overhead, total_duration)
             
             return {
                 "success": True,
@@ -111,9 +113,8 @@ Recommend the best move:""")
             }
             
         except Exception as e:
-            total_duration = time.time() - start_time
-            print(f"[DEBUG] StrategistLangChain: Strategy creation failed: {e}")
-            print(f"[TIMING] Strategist Agent - FAILED after {total_duration:.3f}s")
+            total_duration = time.perf_counter() - start_time
+            logger.debug("StrategistLangChain: Strategy creation failed after %.3fs: %s", total_duration, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -6,10 +6,33 @@ from .base_mcp_agent import BaseMCPAgent
 from crewai import Task
 from typing import Dict, List
 import asyncio
-import json
-from datetime import datetime
+import re
+import time
 from models.factory import ModelFactory
 from utils.config import config
+from utils.llm_pool import run_llm_call
+from game import bitboard
+
+# Response timestamps are monotonic nanoseconds; they only order and time agent replies
+_now = time.monotonic_ns
+
+STRATEGY_PROMPT = """
+                Based on this board analysis: {analysis}
+                Threats identified: {threats}
+                Opportunities: {opportunities}
+                
+                Create a strategic plan that:
+                1. Prioritizes moves by importance
+                2. Provides reasoning for each recommendation
+                3. Includes fallback options
+                4. Assesses win probability
+                """
+
+SHORT_STRATEGY_PROMPT = """Create strategy for Tic Tac Toe.
+Board (9 cells row by row, . = empty): {board}
+Analysis: {analysis}
+Recommend the best move with reasoning.
+Keep response concise."""
 
 
 class StrategistMCPAgent(BaseMCPAgent):
@@ -122,17 +145,8 @@ class StrategistMCPAgent(BaseMCPAgent):
             
             # Create strategy task for CrewAI
             strategy_task = Task(
-                description=f"""
-                Based on this board analysis: {board_analysis}
-                Threats identified: {threats}
-                Opportunities: {opportunities}
-                
-                Create a strategic plan that:
-                1. Prioritizes moves by importance
-                2. Provides reasoning for each recommendation
-                3. Includes fallback options
-                4. Assesses win probability
-                """,
+                description=STRATEGY_PROMPT.format(analysis=board_analysis, threats=threats,
+                                                   opportunities=opportunities),
                 expected_output="Detailed strategic plan with prioritized moves"
             )
             
@@ -144,12 +158,9 @@ class StrategistMCPAgent(BaseMCPAgent):
                 )
             except (AttributeError, asyncio.TimeoutError):
                 # Fallback: use the LLM directly with optimized prompt
-                short_prompt = f"""Create strategy for Tic Tac Toe.
-Board: {json.dumps(board_state)}
-Analysis: {analysis}
-Recommend the best move with reasoning.
-Keep response concise."""
-                strategy_result = await asyncio.to_thread(self.llm.call, short_prompt)
+                short_prompt = SHORT_STRATEGY_PROMPT.format(board=bitboard.board_key(board_state),
+                                                            analysis=analysis)
+                strategy_result = await run_llm_call(self.llm.call, short_prompt)
             
             return {
                 "agent_id": "strategist",
@@ -157,7 +168,7 @@ Keep response concise."""
                 "recommended_move": self.extract_best_move(strategy_result),
                 "confidence": 0.90,
                 "reasoning": self.extract_reasoning(strategy_result),
-                "timestamp": datetime.now().isoformat()
+                "timestamp_ns": _now()
             }
             
         except Exception as e:
@@ -170,16 +181,13 @@ Keep response concise."""
             expected_output="Position evaluation with strategic assessment"
         )
         
-        try:
-            result = await self.execute(evaluation_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(evaluation_task.description)
+        result = await self.execute(evaluation_task)
         
         return {
             "agent_id": "strategist",
             "position_evaluation": result,
             "strategic_advantage": "neutral",  # Extract from result
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     async def recommend_move(self, context_data: Dict) -> Dict:
@@ -189,17 +197,14 @@ Keep response concise."""
             expected_output="Move recommendation with detailed reasoning"
         )
         
-        try:
-            result = await self.execute(recommendation_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(recommendation_task.description)
+        result = await self.execute(recommendation_task)
         
         return {
             "agent_id": "strategist",
             "recommendation": result,
             "move": self.extract_best_move(result),
             "confidence": 0.88,
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     async def assess_win_probability(self, game_state: Dict) -> Dict:
@@ -209,21 +214,17 @@ Keep response concise."""
             expected_output="Win probability assessment with reasoning"
         )
         
-        try:
-            result = await self.execute(probability_task)
-        except AttributeError:
-            result = await self._tracked_llm_call(probability_task.description)
+        result = await self.execute(probability_task)
         
         return {
             "agent_id": "strategist",
             "win_probability": result,
             "confidence": 0.75,
-            "timestamp": datetime.now().isoformat()
+            "timestamp_ns": _now()
         }
     
     def extract_best_move(self, strategy_result: str) -> Dict:
         """Extract best move from strategy result"""
-        import re
 
         # Try to find move in format (row, col) or [row, col] or row: X, col: Y
         patterns = [
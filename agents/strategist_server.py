@@ -4,16 +4,24 @@ Simplified Strategist Agent MCP Server
 Focuses on MCP protocol only, using MCPServerAdapter
 """
 import asyncio
+import logging
 import sys
 import os
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import Tool, TextContent
 import uvicorn
+from contextlib import asynccontextmanager
 from starlette.applications import Starlette
 from starlette.routing import Route
-from starlette.responses import JSONResponse
-import json
+from starlette.responses import Response
+import orjson
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows; fall back to the default asyncio loop
+    uvloop = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +35,7 @@ class SimplifiedStrategistServer:
     def __init__(self, port=3002):
         self.port = port
         self.agent = None
+        self.tools_registry = {}
         self.server = Server("strategist-mcp-server")
         self.app = None
         
@@ -43,6 +52,7 @@ class SimplifiedStrategistServer:
         
         # Start MCP server to register tools
         await self.agent.start_mcp_server()
+        self.tools_registry = self.agent.tools_registry
         
         # Register MCP tools
         await self._register_tools()
@@ -54,66 +64,73 @@ class SimplifiedStrategistServer:
             return
             
         # Get tools from agent
-        tools_registry = self.agent.__dict__.get('tools_registry', {})
+        tools_registry = self.tools_registry
         print(f"[DEBUG] Strategist tools registry: {tools_registry}")
         
-        for tool_name, tool_info in tools_registry.items():
-            @self.server.list_tools()
-            async def list_tools() -> list[Tool]:
-                tools = []
-                if self.agent:
-                    tools_registry = self.agent.__dict__.get('tools_registry', {})
-                    for name, tool_info in tools_registry.items():
-                        tools.append(Tool(
-                            name=name,
-                            description=tool_info.get('description', ''),
-                            inputSchema=tool_info.get('schema', {})
-                        ))
-                return tools
-            
-            @self.server.call_tool()
-            async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-                if self.agent and name in self.agent.__dict__.get('tools_registry', {}):
-                    try:
-                        handler = self.agent.__dict__['tools_registry'][name]['handler']
-                        result = await handler(arguments)
-                        return [TextContent(type="text", text=str(result))]
-                    except Exception as e:
-                        return [TextContent(
-                            type="text", 
-                            text=json.dumps({"error": str(e)})
-                        )]
-                else:
+        # Tool listing is static after registration, so build it once
+        tools = [
+            Tool(
+                name=name,
+                description=tool_info.get('description', ''),
+                inputSchema=tool_info.get('inputSchema', {})
+            )
+            for name, tool_info in tools_registry.items()
+        ]
+        handlers = {name: tool_info['handler'] for name, tool_info in tools_registry.items()}
+        
+        @self.server.list_tools()
+        async def list_tools() -> list[Tool]:
+            return tools
+        
+        @self.server.call_tool()
+        async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+            handler = handlers.get(name)
+            if handler is not None:
+                try:
+                    result = await handler(arguments)
+                    return [TextContent(type="text", text=orjson.dumps(result).decode())]
+                except Exception as e:
                     return [TextContent(
-                        type="text",
-                        text=json.dumps({"error": f"Tool '{name}' not found"})
+                        type="text", 
+                        text=orjson.dumps({"error": str(e)}).decode()
                     )]
+            else:
+                return [TextContent(
+                    type="text",
+                    text=orjson.dumps({"error": f"Tool '{name}' not found"}).decode()
+                )]
     
     def create_app(self) -> Starlette:
         """Create Starlette app with MCP SSE transport"""
         
         # Create SSE transport
         sse_transport = SseServerTransport("/messages")
+        # Initialization options are fixed once tools are registered; share them across connections
+        init_options = self.server.create_initialization_options()
         
         async def handle_sse(request):
             """Handle SSE connection requests"""
             async with sse_transport.connect_sse(request.scope, request.receive, request.send) as (read_stream, write_stream):
                 # Run the MCP server with the SSE streams
-                await self.server.run(read_stream, write_stream)
+                await self.server.run(read_stream, write_stream, init_options)
         
         async def handle_messages(request):
             """Handle MCP message requests"""
             return await sse_transport.handle_post_message(request.scope, request.receive, request.send)
         
+        # Health response is fixed once the agent is initialized, so encode it once
+        health_bytes = orjson.dumps({
+            "status": "healthy",
+            "agent_id": "strategist",
+            "mcp_version": "1.0",
+            "transport": "sse",
+            "model": self.agent.current_model if self.agent else "unknown",
+            "tools_count": len(self.agent.tools_registry) if self.agent else 0
+        })
+        
         async def handle_health(request):
             """Health check endpoint"""
-            return JSONResponse({
-                "status": "healthy",
-                "agent_id": "strategist",
-                "mcp_version": "1.0",
-                "transport": "sse",
-                "tools_count": len(self.agent.__dict__.get('tools_registry', {})) if self.agent else 0
-            })
+            return Response(health_bytes, media_type="application/json")
         
         routes = [
             Route("/", handle_sse, methods=["GET"]),
@@ -121,7 +138,13 @@ class SimplifiedStrategistServer:
             Route("/health", handle_health, methods=["GET"])
         ]
         
-        app = Starlette(debug=True, routes=routes)
+        @asynccontextmanager
+        async def lifespan(app):
+            yield
+            # Release the LLM clients' pooled connections
+            await ModelFactory.aclose()
+        
+        app = Starlette(debug=True, routes=routes, lifespan=lifespan)
         return app
     
     async def run(self):
@@ -141,7 +164,12 @@ class SimplifiedStrategistServer:
             self.app,
             host="0.0.0.0",
             port=self.port,
-            log_level="info"
+            http="httptools",
+            log_level="warning",
+            # Per-request access lines dominate CPU for small JSON-RPC payloads
+            access_log=False,
+            # Keep MCP client connections open across bursts of small JSON-RPC calls
+            timeout_keep_alive=75
         )
         server = uvicorn.Server(config)
         await server.serve()
@@ -152,4 +180,9 @@ async def main():
     await server.run()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Per-call agent diagnostics are logged at DEBUG; set LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,55 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled line kernels for game.bitboard
+
+Same contract as the pure-Python completing_mask and fork_mask: masks are
+9-bit ints with bit (3 * row + col) per cell. game.bitboard uses these when
+the extension is built (`python scripts/build_minimax.py`).
+"""
+from libc.stdint cimport uint16_t
+
+cdef uint16_t[8] WIN_MASKS = [0x007, 0x038, 0x1C0, 0x049, 0x092, 0x124, 0x111, 0x054]
+cdef uint16_t FULL = 0x1FF
+
+
+cdef inline int popcount(uint16_t bits) noexcept nogil:
+    cdef int count = 0
+    while bits:
+        bits &= bits - 1
+        count += 1
+    return count
+
+
+cdef inline uint16_t completing(uint16_t own, uint16_t empty) noexcept nogil:
+    cdef int i
+    cdef uint16_t cells = 0
+    for i in range(8):
+        if popcount(own & WIN_MASKS[i]) == 2:
+            cells |= empty & WIN_MASKS[i]
+    return cells
+
+
+cdef inline uint16_t forks(uint16_t own, uint16_t empty) noexcept nogil:
+    cdef int i
+    cdef uint16_t cell, cells = 0
+    for i in range(9):
+        cell = 1 << i
+        if empty & cell and popcount(completing(own | cell, empty & ~cell)) >= 2:
+            cells |= cell
+    return cells
+
+
+def completing_mask(int own, int empty):
+    """Mask of empty cells that complete a line for own"""
+    cdef uint16_t cells
+    with nogil:
+        cells = completing(<uint16_t>(own & FULL), <uint16_t>(empty & FULL))
+    return cells
+
+
+def fork_mask(int own, int empty):
+    """Mask of empty cells that leave own with two or more winning cells"""
+    cdef uint16_t cells
+    with nogil:
+        cells = forks(<uint16_t>(own & FULL), <uint16_t>(empty & FULL))
+    return cells
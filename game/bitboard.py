@@ -0,0 +1,245 @@
+"""
+Tic Tac Toe Bitboard Module
+Deterministic board analysis over 9-bit masks (threats, wins, forks)
+"""
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+# Board cells as flat indices 0-8 (row * 3 + col); each line is a winning row, column or diagonal
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+)
+
+# Bitboard form of WIN_LINES: bit (3 * row + col) set for each cell of the line
+WIN_MASKS = tuple(sum(1 << i for i in line) for line in WIN_LINES)
+
+# (row, col) of every cell, in row-major order
+CELLS = tuple((i, j) for i in range(3) for j in range(3))
+
+CENTER_MASK = 1 << 4
+CORNER_MASK = (1 << 0) | (1 << 2) | (1 << 6) | (1 << 8)
+FULL_MASK = (1 << 9) - 1
+
+# Game phase by number of empty cells: up to 2 filled is the opening, up to 5 the midgame
+GAME_PHASES = ("endgame",) * 4 + ("midgame",) * 3 + ("opening",) * 3
+
+# The 8 symmetries of the square (D4) as cell maps: rotations by 0/90/180/270
+# degrees, then the horizontal, vertical, main and anti-diagonal reflections
+_SYMMETRIES = (
+    lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+    lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c), lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r)
+)
+
+
+def _permutation_table(perm: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Image of every 9-bit mask when cell i moves to cell perm[i]"""
+    return tuple(sum(1 << perm[i] for i in range(9) if mask >> i & 1) for mask in range(1 << 9))
+
+
+_PERMUTATIONS = tuple(tuple(3 * r + c for r, c in (sym(i, j) for i, j in CELLS)) for sym in _SYMMETRIES)
+# SYMMETRY_TABLES[s][mask] applies symmetry s to mask; INVERSE_TABLES[s] undoes it
+SYMMETRY_TABLES = tuple(_permutation_table(perm) for perm in _PERMUTATIONS)
+INVERSE_TABLES = tuple(
+    _permutation_table(tuple(perm.index(i) for i in range(9))) for perm in _PERMUTATIONS
+)
+
+
+def board_key(board: List[List[str]]) -> str:
+    """Flatten the board to a 9-char key ("." for empty)"""
+    return "".join(cell or "." for row in board for cell in row)
+
+
+class BoardCache:
+    """LRU cache of per-board results keyed by board_key
+
+    Tic Tac Toe has 5478 legal positions, so the default size holds every
+    reachable board.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key (marking it recently used), or None"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store value for key, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def canonical(x: int, o: int) -> Tuple[int, int, int]:
+    """Smallest (x, o) image of a position under D4, plus the symmetry that produced it
+
+    Boards that differ only by rotation or reflection share one canonical
+    form (765 classes instead of 5478 positions). Map cells of the canonical
+    position back with INVERSE_TABLES[symmetry].
+    """
+    return min((table[x], table[o], sym) for sym, table in enumerate(SYMMETRY_TABLES))
+
+
+def board_masks(board: List[List[str]]) -> Dict[str, int]:
+    """Pack the board into one 9-bit mask per cell value ("X", "O", "")"""
+    masks = {"X": 0, "O": 0, "": 0}
+    for bit, (i, j) in enumerate(CELLS):
+        masks[board[i][j]] |= 1 << bit
+    return masks
+
+
+def empty_mask(board: List[List[str]]) -> int:
+    """9-bit mask of the empty cells"""
+    return sum(1 << bit for bit, cell in enumerate(chain.from_iterable(board)) if cell == "")
+
+
+def completing_mask(own: int, empty: int) -> int:
+    """Mask of empty cells that complete a line for own"""
+    cells = 0
+    for mask in WIN_MASKS:
+        if (own & mask).bit_count() == 2:
+            cells |= empty & mask
+    return cells
+
+
+def fork_mask(own: int, empty: int) -> int:
+    """Mask of empty cells that leave own with two or more winning cells"""
+    cells = 0
+    for bit in range(9):
+        cell = 1 << bit
+        if empty & cell and completing_mask(own | cell, empty & ~cell).bit_count() >= 2:
+            cells |= cell
+    return cells
+
+
+# Compiled kernels (game/_bitboard.pyx) replace the two functions above when built
+try:
+    from game._bitboard import completing_mask, fork_mask  # noqa: F811
+except ImportError:
+    pass
+
+
+def mask_cells(mask: int) -> List[Dict[str, int]]:
+    """Return {"row", "col"} for each cell set in mask, visiting only the set bits"""
+    cells = []
+    while mask:
+        low = mask & -mask
+        i, j = CELLS[low.bit_length() - 1]
+        cells.append({"row": i, "col": j})
+        mask ^= low
+    return cells
+
+
+def _analysis_masks(own: int, theirs: int, empty: int) -> Tuple[int, int, int, int]:
+    """(threats, opportunities, forks, opponent forks) masks for own to move"""
+    return (
+        completing_mask(theirs, empty),
+        completing_mask(own, empty),
+        fork_mask(own, empty),
+        fork_mask(theirs, empty)
+    )
+
+
+def _analysis_from_masks(threats: int, opportunities: int, forks: int, opponent_forks: int,
+                         empty: int) -> Dict[str, Any]:
+    """Build the analyze_board result from its masks"""
+    return {
+        "threats": mask_cells(threats),
+        "opportunities": mask_cells(opportunities),
+        "forks": mask_cells(forks),
+        "opponent_forks": mask_cells(opponent_forks),
+        "center_available": bool(empty & CENTER_MASK),
+        "corners_available": mask_cells(empty & CORNER_MASK),
+        "available_moves": mask_cells(empty),
+        "game_phase": GAME_PHASES[empty.bit_count()]
+    }
+
+
+def analyze_board(board: List[List[str]], player: str = "O", opponent: str = "X") -> Dict[str, Any]:
+    """Threats, winning moves and forks for player on a 3x3 board
+
+    Threats are cells the opponent would win on next move (block them);
+    opportunities are cells that win for player now.
+    """
+    masks = board_masks(board)
+    empty = masks[""]
+    return _analysis_from_masks(*_analysis_masks(masks[player], masks[opponent], empty), empty)
+
+
+# Analyses shared by every scout implementation in the process
+_analysis_cache = BoardCache()
+# Analysis masks per D4 class, so a rotated or reflected board skips the line scans
+_canonical_cache = BoardCache(maxsize=1024)
+
+
+def cached_analysis(board: List[List[str]]) -> Dict[str, Any]:
+    """analyze_board for the AI (O), memoized process-wide by board key
+
+    A board seen for the first time reuses the masks of any symmetric board
+    analyzed before, mapped back through the symmetry. The returned dict is
+    shared; callers must not mutate it.
+    """
+    key = board_key(board)
+    analysis = _analysis_cache.get(key)
+    if analysis is None:
+        masks = board_masks(board)
+        x, o, sym = canonical(masks["X"], masks["O"])
+        class_key = (x, o)
+        class_masks = _canonical_cache.get(class_key)
+        if class_masks is None:
+            class_masks = _analysis_masks(o, x, FULL_MASK & ~(x | o))
+            _canonical_cache.put(class_key, class_masks)
+        inverse = INVERSE_TABLES[sym]
+        analysis = _analysis_from_masks(*(inverse[mask] for mask in class_masks), masks[""])
+        _analysis_cache.put(key, analysis)
+    return analysis
+
+
+def recommend_move(analysis: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Best cell by tactical priority: win, block, fork, block a fork, center, corner, any"""
+    for moves in (analysis["opportunities"], analysis["threats"], analysis["forks"],
+                  analysis["opponent_forks"]):
+        if moves:
+            return moves[0]
+    if analysis["center_available"]:
+        return {"row": 1, "col": 1}
+    moves = analysis["corners_available"] or analysis["available_moves"]
+    return moves[0] if moves else None
+
+
+# Compact JSON text of each board, as embedded in LLM prompts
+_json_cache = BoardCache()
+
+
+def board_json(board: List[List[str]]) -> str:
+    """orjson text of the board, memoized process-wide by board key"""
+    key = board_key(board)
+    text = _json_cache.get(key)
+    if text is None:
+        text = orjson.dumps(board).decode()
+        _json_cache.put(key, text)
+    return text
+
+
+def summarize(analysis: Dict[str, Any]) -> str:
+    """One-line text summary of an analyze_board result"""
+    def cells(moves):
+        return ", ".join(f"({move['row']},{move['col']})" for move in moves) or "none"
+    return (
+        f"Phase: {analysis['game_phase']}. Win at: {cells(analysis['opportunities'])}. "
+        f"Block at: {cells(analysis['threats'])}. Forks: {cells(analysis['forks'])}. "
+        f"Opponent forks: {cells(analysis['opponent_forks'])}."
+    )
@@ -3,10 +3,26 @@ MCP Game Coordinator
 Coordinates game flow using MCP protocol between agents
 """
 import asyncio
+import json
+import logging
+import random
+import re
 import time
+import traceback
 from typing import Dict, List, Optional
-from datetime import datetime
+from utils.clock import iso_now
+from utils.llm_pool import run_llm_call
 from .state import TicTacToeGameState
+from . import bitboard
+
+logger = logging.getLogger(__name__)
+
+# Message flow recorded when each agent's call succeeds
+_FLOW_PATTERNS = {
+    "scout": "scout_to_strategist",
+    "strategist": "strategist_to_executor",
+    "executor": "executor_to_scout"
+}
 
 # Import MCPServerAdapter for distributed mode
 try:
@@ -135,7 +151,7 @@ class MCPGameCoordinator:
         """Get AI move - direct agent calls in local mode, MCP coordination in distributed mode"""
         
         print(f"[DEBUG] Starting AI move (distributed={self.distributed})")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         if self.distributed:
             # DISTRIBUTED MODE: Use MCP coordination
@@ -146,21 +162,21 @@ class MCPGameCoordinator:
                     timeout=10.0
                 )
                 if result and "error" not in result:
-                    total_time = time.time() - start_time
+                    total_time = time.perf_counter() - start_time
                     print(f"[TIMING] MCP Coordination - Total: {total_time:.3f}s")
                     return result
                 else:
-                    total_time = time.time() - start_time
+                    total_time = time.perf_counter() - start_time
                     print(f"[DEBUG] MCP coordination returned error: {result}")
                     print(f"[TIMING] MCP Coordination - FAILED after {total_time:.3f}s")
                     return {"error": "MCP coordination failed", "details": result}
             except asyncio.TimeoutError:
-                total_time = time.time() - start_time
+                total_time = time.perf_counter() - start_time
                 print(f"[DEBUG] MCP coordination timed out")
                 print(f"[TIMING] MCP Coordination - TIMEOUT after {total_time:.3f}s")
                 return {"error": "MCP coordination timed out"}
             except Exception as e:
-                total_time = time.time() - start_time
+                total_time = time.perf_counter() - start_time
                 print(f"[DEBUG] MCP coordination failed: {e}")
                 print(f"[TIMING] MCP Coordination - FAILED after {total_time:.3f}s")
                 return {"error": f"MCP coordination failed: {e}"}
@@ -216,7 +232,7 @@ class MCPGameCoordinator:
                 if not move_success:
                     return {"error": "Failed to make AI move"}
                 
-                total_time = time.time() - start_time
+                total_time = time.perf_counter() - start_time
                 print(f"[TIMING] Local Coordination - Total: {total_time:.3f}s")
                 
                 return {
@@ -232,7 +248,7 @@ class MCPGameCoordinator:
                 }
                 
             except Exception as e:
-                total_time = time.time() - start_time
+                total_time = time.perf_counter() - start_time
                 print(f"[DEBUG] Direct agent calls failed: {e}")
                 print(f"[TIMING] Local Coordination - FAILED after {total_time:.3f}s")
                 return {"error": f"Agent calls failed: {e}"}
@@ -431,13 +447,13 @@ class MCPGameCoordinator:
             "threats": self.analyze_threats(self.game_state.board),
             "opportunities": self.analyze_opportunities(self.game_state.board),
             "confidence": 0.8,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "fast_fallback": True
         }
     
     async def _quick_scout_analysis(self) -> Dict:
         """Optimized scout analysis with fast fallback"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             board_str = self._board_to_string(self.game_state.board)
             available_moves = self.get_available_moves(self.game_state.board)
@@ -483,8 +499,9 @@ class MCPGameCoordinator:
                     return self._get_fallback_scout_analysis(available_moves)
             
             # Track metrics
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("scout", response_time, success=True)
             
             # Ensure result has required fields
             if not isinstance(result, dict):
@@ -497,7 +514,7 @@ class MCPGameCoordinator:
                 "threats": result.get("threats", self.analyze_threats(self.game_state.board)),
                 "opportunities": result.get("opportunities", self.analyze_opportunities(self.game_state.board)),
                 "confidence": 0.85,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             })
             
             print(f"[DEBUG] Scout analysis completed in {response_time:.3f}s")
@@ -505,13 +522,14 @@ class MCPGameCoordinator:
             
         except Exception as e:
             print(f"[DEBUG] Scout analysis error: {e}")
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("scout", response_time, success=False)
             return {"error": str(e), "agent_id": "scout"}
     
     async def _quick_strategy_creation(self, observation: Dict) -> Dict:
         """Optimized strategy creation with fast fallback"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             print(f"[DEBUG] Strategist: Fast strategy creation")
 
@@ -527,7 +545,7 @@ class MCPGameCoordinator:
                     "recommended_move": self._get_strategic_fallback_move(available_moves),
                     "confidence": 0.8,
                     "reasoning": "Fast strategic reasoning",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": iso_now(),
                     "fast_fallback": True
                 }
             
@@ -551,13 +569,14 @@ class MCPGameCoordinator:
                     "recommended_move": self._get_strategic_fallback_move(available_moves),
                     "confidence": 0.8,
                     "reasoning": "Fast strategic reasoning",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": iso_now(),
                     "timeout_fallback": True
                 }
             
             # Track metrics
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("strategist", response_time, success=True)
             
             # Ensure result has required fields
             if not isinstance(result, dict):
@@ -569,7 +588,7 @@ class MCPGameCoordinator:
                 "recommended_move": result.get("recommended_move", self._get_strategic_fallback_move(self.get_available_moves(self.game_state.board))),
                 "confidence": 0.9,
                 "reasoning": result.get("reasoning", "Strategic reasoning"),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             })
             
             print(f"[DEBUG] Strategist strategy completed in {response_time:.3f}s")
@@ -577,13 +596,14 @@ class MCPGameCoordinator:
             
         except Exception as e:
             print(f"[DEBUG] Strategy creation error: {e}")
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("strategist", response_time, success=False)
             return {"error": str(e), "agent_id": "strategist"}
     
     async def _quick_move_execution(self, strategy: Dict) -> Dict:
         """Optimized move execution with fast fallback"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             recommended_move = strategy.get("recommended_move", {})
             print(f"[DEBUG] Executor: Fast move execution")
@@ -599,7 +619,7 @@ class MCPGameCoordinator:
                     "result": "Move executed successfully (fast fallback)",
                     "success": True,
                     "game_state": "updated",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": iso_now(),
                     "fast_fallback": True
                 }
             
@@ -620,13 +640,14 @@ class MCPGameCoordinator:
                     "result": "Move executed successfully (timeout fallback)",
                     "success": True,
                     "game_state": "updated",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": iso_now(),
                     "timeout_fallback": True
                 }
             
             # Track metrics
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("executor", response_time, success=True)
             
             # Ensure result has required fields
             if not isinstance(result, dict):
@@ -638,7 +659,7 @@ class MCPGameCoordinator:
                 "result": result.get("result", "Move executed successfully"),
                 "success": result.get("success", True),
                 "game_state": "updated",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             })
             
             print(f"[DEBUG] Executor execution completed in {response_time:.3f}s")
@@ -646,15 +667,14 @@ class MCPGameCoordinator:
             
         except Exception as e:
             print(f"[DEBUG] Move execution error: {e}")
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
+            self._record_agent_call("executor", response_time, success=False)
             return {"error": str(e), "agent_id": "executor"}
     
     def _extract_move_from_response(self, response: str) -> Dict:
         """Extract move coordinates from LLM response"""
         try:
-            import re
-            import json
             
             # Try to find JSON in response
             json_match = re.search(r'\{[^}]*"row"[^}]*"col"[^}]*\}', response)
@@ -737,12 +757,10 @@ Return only JSON: {{"row": number, "col": number}}"""
             
             # Get LLM response
             print(f"[DEBUG] Getting LLM response for prompt: {prompt[:100]}...")
-            response = await asyncio.to_thread(agent.llm.call, prompt)
+            response = await run_llm_call(agent.llm.call, prompt)
             print(f"[DEBUG] LLM response: {response}")
             
             # Parse the response
-            import json
-            import re
             
             # Extract JSON from response
             json_match = re.search(r'\{[^}]*"row"[^}]*"col"[^}]*\}', str(response))
@@ -789,7 +807,6 @@ Return only JSON: {{"row": number, "col": number}}"""
     
     async def call_agent(self, agent_name: str, method: str, data: Dict) -> Dict:
         """Make MCP call to agent with real timing"""
-        import time
         
         agent = self.agents.get(agent_name)
         if not agent:
@@ -799,7 +816,7 @@ Return only JSON: {{"row": number, "col": number}}"""
         print(f"[DEBUG] MCP Call: {agent_name}.{method} with agent type: {type(agent)}")
         
         # Measure actual agent response time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Call the actual agent method
@@ -819,24 +836,25 @@ Return only JSON: {{"row": number, "col": number}}"""
                 print(f"[DEBUG] Unknown method {method} for {agent_name}")
                 return {"error": f"Unknown method {method} for {agent_name}"}
             
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
             
             # Track the real response time in the agent with estimated tokens
             # For real LLM calls, we'd get actual token count, but for streamlined calls we estimate
             estimated_tokens = 80  # Average for agent coordination
             agent.track_request(response_time, success=True, tokens=estimated_tokens)
+            self._record_agent_call(agent_name, response_time, success=True, tokens=estimated_tokens)
             
             print(f"[DEBUG] Agent call successful, response time: {response_time:.3f}s")
             return result
             
         except Exception as e:
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time = end_time - start_time
             # Track failed request with minimal tokens
             agent.track_request(response_time, success=False, tokens=10)
+            self._record_agent_call(agent_name, response_time, success=False, tokens=10)
             print(f"[DEBUG] Agent call failed with exception: {type(e).__name__}: {e}")
-            import traceback
             print(f"[DEBUG] Traceback: {traceback.format_exc()}")
             return {"error": f"{type(e).__name__}: {str(e)}"}
     
@@ -857,7 +875,7 @@ Return only JSON: {{"row": number, "col": number}}"""
             "threats": threats,
             "opportunities": opportunities,
             "confidence": 0.85,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     
     async def strategist_create_strategy(self, data: Dict) -> Dict:
@@ -876,7 +894,7 @@ Return only JSON: {{"row": number, "col": number}}"""
             "recommended_move": recommended_move,
             "confidence": 0.90,
             "reasoning": f"LLM selected optimal move from {len(available_moves)} options",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     
     async def executor_execute_move(self, data: Dict) -> Dict:
@@ -889,7 +907,7 @@ Return only JSON: {{"row": number, "col": number}}"""
                 "agent_id": "executor",
                 "error": "Invalid move format",
                 "success": False,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             }
         
         return {
@@ -898,7 +916,7 @@ Return only JSON: {{"row": number, "col": number}}"""
             "result": "Move executed successfully",
             "success": True,
             "game_state": "updated",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     
     async def get_llm_move_recommendation(self, board: List[List[str]], available_moves: List[Dict], threats: List[str], opportunities: List[str]) -> Dict:
@@ -939,16 +957,14 @@ Example: 1,1 for center position
         except Exception as e:
             print(f"Error getting LLM recommendation: {e}")
             # Fallback to random move
-            import random
             return random.choice(available_moves) if available_moves else {"row": 1, "col": 1}
     
     def format_board_for_llm(self, board: List[List[str]]) -> str:
         """Format board for LLM analysis"""
-        result = []
-        for i, row in enumerate(board):
-            row_str = " | ".join([cell if cell else f"({i},{j})" for j, cell in enumerate(row)])
-            result.append(f"Row {i}: {row_str}")
-        return "\n".join(result)
+        return "\n".join(
+            f"Row {i}: " + " | ".join(cell or f"({i},{j})" for j, cell in enumerate(row))
+            for i, row in enumerate(board)
+        )
     
     def simple_ai_strategy(self, board: List[List[str]], available_moves: List[Dict], threats: List[str], opportunities: List[str]) -> Dict:
         """Simple AI strategy until LLM integration"""
@@ -974,7 +990,6 @@ Example: 1,1 for center position
                 return corner
         
         # Priority 5: Take any available move
-        import random
         return random.choice(available_moves) if available_moves else {"row": 1, "col": 1}
     
     def would_win(self, board: List[List[str]], move: Dict, player: str) -> bool:
@@ -995,105 +1010,77 @@ Example: 1,1 for center position
     
     def check_win_condition(self, board: List[List[str]], player: str) -> bool:
         """Check if the given player has won"""
-        # Check rows
-        for row in board:
-            if all(cell == player for cell in row):
-                return True
-        
-        # Check columns
-        for col in range(3):
-            if all(board[row][col] == player for row in range(3)):
-                return True
-        
-        # Check diagonals
-        if all(board[i][i] == player for i in range(3)):
-            return True
-        if all(board[i][2-i] == player for i in range(3)):
-            return True
-        
-        return False
+        own = bitboard.board_masks(board)[player]
+        return any(own & mask == mask for mask in bitboard.WIN_MASKS)
     
     def analyze_threats(self, board: List[List[str]]) -> List[str]:
         """Analyze board for immediate threats"""
-        threats = []
-        
-        # Check if opponent can win in next move
-        for row in range(3):
-            for col in range(3):
-                if board[row][col] == "":
-                    if self.would_win(board, {"row": row, "col": col}, "X"):
-                        threats.append(f"Opponent can win at ({row},{col})")
-        
-        return threats
+        # Cells where the opponent can win in next move
+        masks = bitboard.board_masks(board)
+        return [f"Opponent can win at ({cell['row']},{cell['col']})"
+                for cell in bitboard.mask_cells(bitboard.completing_mask(masks["X"], masks[""]))]
     
     def analyze_opportunities(self, board: List[List[str]]) -> List[str]:
         """Analyze board for winning opportunities"""
-        opportunities = []
-        
-        # Check if AI can win in next move
-        for row in range(3):
-            for col in range(3):
-                if board[row][col] == "":
-                    if self.would_win(board, {"row": row, "col": col}, "O"):
-                        opportunities.append(f"AI can win at ({row},{col})")
-        
-        return opportunities
+        # Cells where the AI can win in next move
+        masks = bitboard.board_masks(board)
+        return [f"AI can win at ({cell['row']},{cell['col']})"
+                for cell in bitboard.mask_cells(bitboard.completing_mask(masks["O"], masks[""]))]
     
     def get_available_moves(self, board_state: List[List[str]]) -> List[Dict]:
         """Get available moves from board state"""
-        available = []
-        for row in range(3):
-            for col in range(3):
-                if board_state[row][col] == "":
-                    available.append({"row": row, "col": col})
-        return available
+        return bitboard.mask_cells(bitboard.empty_mask(board_state))
+    
+    def _first_completing_cell(self, player: str) -> Optional[Dict]:
+        """First empty cell (row-major) that completes a line for player, or None"""
+        masks = bitboard.board_masks(self.game_state.board)
+        cells = bitboard.completing_mask(masks[player], masks[""])
+        if not cells:
+            return None
+        row, col = bitboard.CELLS[(cells & -cells).bit_length() - 1]
+        return {"row": row, "col": col}
     
     def _find_blocking_move(self) -> Optional[Dict]:
         """Find a move that blocks the opponent's immediate win"""
-        board = self.game_state.board
-        player_symbol = self.game_state.player_symbol
-        
-        # Check if opponent can win in next move
-        for row in range(3):
-            for col in range(3):
-                if board[row][col] == "":
-                    # Test if this move would win for opponent
-                    board[row][col] = player_symbol
-                    if self.check_win_condition(board, player_symbol):
-                        board[row][col] = ""  # Restore board
-                        return {"row": row, "col": col, "reasoning": f"Block opponent's win at ({row},{col})"}
-                    board[row][col] = ""  # Restore board
-        
-        return None
+        move = self._first_completing_cell(self.game_state.player_symbol)
+        if move:
+            move["reasoning"] = f"Block opponent's win at ({move['row']},{move['col']})"
+        return move
     
     def _find_winning_move(self) -> Optional[Dict]:
         """Find a move that wins the game for AI"""
-        board = self.game_state.board
-        ai_symbol = self.game_state.ai_symbol
-        
-        # Check if AI can win in next move
-        for row in range(3):
-            for col in range(3):
-                if board[row][col] == "":
-                    # Test if this move would win for AI
-                    board[row][col] = ai_symbol
-                    if self.check_win_condition(board, ai_symbol):
-                        board[row][col] = ""  # Restore board
-                        return {"row": row, "col": col, "reasoning": f"Win the game at ({row},{col})"}
-                    board[row][col] = ""  # Restore board
-        
-        return None
+        move = self._first_completing_cell(self.game_state.ai_symbol)
+        if move:
+            move["reasoning"] = f"Win the game at ({move['row']},{move['col']})"
+        return move
 
+    def _record_agent_call(self, agent_name: str, response_time: float, success: bool, tokens: int = 0):
+        """Record one agent call's metrics on the game state in a single update"""
+        response_time_ms = response_time * 1000
+        metrics = {
+            "mcp_messages": 1,
+            "total_messages": 1,
+            "response_times": {agent_name: response_time_ms},
+            "message_latencies": [response_time_ms],
+            "flow_patterns": [_FLOW_PATTERNS.get(agent_name) if success else "error_responses"]
+        }
+        if tokens:
+            metrics["token_usage"] = {agent_name: tokens}
+        if not success:
+            metrics["protocol_errors"] = 1
+        self.game_state.bulk_update(metrics)
+    
     def log_mcp_message(self, agent: str, message_type: str, data: Dict):
         """Log MCP protocol message"""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "agent": agent,
             "message_type": message_type,
             "data": data
         }
         self.mcp_logs.append(log_entry)
-        print(f"[MCP] {agent} -> {message_type}: {data}")
+        # Payloads are full agent results; only format them when debugging
+        logger.debug("[MCP] %s -> %s: %s", agent, message_type, data)
     
     def get_agent_status(self) -> Dict:
         """Get status of all agents"""
@@ -1161,7 +1148,6 @@ Example: 1,1 for center position
         except Exception as e:
             print(f"Error in fallback AI move: {e}")
             # Final fallback to random move
-            import random
             available_moves = self.get_available_moves(self.game_state.board)
             if not available_moves:
                 return {"error": "No available moves"}
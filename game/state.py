@@ -6,6 +6,8 @@ import random
 from datetime import datetime
 from typing import List, Optional, Tuple
 from schemas.observation import Observation, GameHistory, BoardPosition
+from . import bitboard
+from utils.resources import resource_sampler
 
 class TicTacToeGameState:
     """Manages the state of a Tic Tac Toe game"""
@@ -19,6 +21,11 @@ class TicTacToeGameState:
         self.winner = None
         self.player_symbol = "X"
         self.ai_symbol = "O"
+        # Observation of the current position; cleared whenever the board changes
+        self._observation: Optional[Observation] = None
+        # game_history is append-only, so each move is serialized once as it is recorded
+        self._history_dicts: List[dict] = []
+        self._moves_by_player = {"player": 0, "ai": 0}
         
         # Metrics tracking
         self.game_start_time = datetime.now()
@@ -71,6 +78,9 @@ class TicTacToeGameState:
         self.game_history = []
         self.game_over = False
         self.winner = None
+        self._observation = None
+        self._history_dicts = []
+        self._moves_by_player = {"player": 0, "ai": 0}
         
         # Reset metrics
         self.game_start_time = datetime.now()
@@ -158,14 +168,41 @@ class TicTacToeGameState:
         self.resource_utilization["cpu_percent"] = cpu_percent
         self.resource_utilization["memory_mb"] = memory_mb
     
+    def bulk_update(self, metrics: dict):
+        """Apply several metric updates in one call (e.g. once per agent call)
+
+        Keys are optional: mcp_messages, total_messages and protocol_errors are
+        increments; response_times and token_usage map agent -> value;
+        llm_costs maps llm -> cost; message_latencies and flow_patterns are
+        lists; resource_utilization is merged; message_queue_depth is set.
+        """
+        self.mcp_message_count += metrics.get("mcp_messages", 0)
+        self.total_message_count += metrics.get("total_messages", 0)
+        self.protocol_errors += metrics.get("protocol_errors", 0)
+        for agent, response_time_ms in metrics.get("response_times", {}).items():
+            if agent in self.agent_response_times:
+                self.agent_response_times[agent].append(response_time_ms)
+        for agent, tokens in metrics.get("token_usage", {}).items():
+            if agent in self.token_usage_per_agent:
+                self.token_usage_per_agent[agent] += tokens
+        for llm, cost in metrics.get("llm_costs", {}).items():
+            if llm in self.llm_costs:
+                self.llm_costs[llm] += cost
+        self.message_latencies.extend(metrics.get("message_latencies", ()))
+        for pattern in metrics.get("flow_patterns", ()):
+            if pattern in self.message_flow_patterns:
+                self.message_flow_patterns[pattern] += 1
+        if "resource_utilization" in metrics:
+            self.resource_utilization.update(metrics["resource_utilization"])
+        if "message_queue_depth" in metrics:
+            self.message_queue_depth = metrics["message_queue_depth"]
+    
     def _initialize_baseline_metrics(self):
         """Initialize baseline metrics for demonstration"""
-        import psutil
-        
         # Set initial resource utilization
         try:
-            self.resource_utilization["cpu_percent"] = psutil.cpu_percent()
-            self.resource_utilization["memory_mb"] = psutil.virtual_memory().used / (1024 * 1024)
+            self.resource_utilization["cpu_percent"] = resource_sampler.cpu_percent
+            self.resource_utilization["memory_mb"] = resource_sampler.memory_mb
         except:
             self.resource_utilization["cpu_percent"] = 15.5
             self.resource_utilization["memory_mb"] = 2048.0
@@ -260,12 +297,8 @@ class TicTacToeGameState:
     
     def get_available_moves(self) -> List[BoardPosition]:
         """Get all available (empty) positions on the board"""
-        moves = []
-        for row in range(3):
-            for col in range(3):
-                if self.board[row][col] == "":
-                    moves.append(BoardPosition(row=row, col=col, value=""))
-        return moves
+        board = self.board
+        return [BoardPosition(row=i, col=j, value="") for i, j in bitboard.CELLS if board[i][j] == ""]
     
     def make_move(self, row: int, col: int, player: str) -> bool:
         """Make a move on the board"""
@@ -278,6 +311,7 @@ class TicTacToeGameState:
         
         symbol = self.player_symbol if player == "player" else self.ai_symbol
         self.board[row][col] = symbol
+        self._observation = None
         self.move_number += 1
         
         # Record the move
@@ -292,6 +326,10 @@ class TicTacToeGameState:
         # Check for game over
         self._check_game_over()
         
+        # Serialize after the game-over check, which sets the move's result
+        self._history_dicts.append(move_history.model_dump())
+        self._moves_by_player[player] += 1
+        
         # Switch players
         if not self.game_over:
             self.current_player = "ai" if player == "player" else "player"
@@ -452,6 +490,12 @@ class TicTacToeGameState:
     
     def get_observation(self) -> Observation:
         """Get the current game state as an observation for the Scout agent"""
+        if self._observation is None:
+            self._observation = self._build_observation()
+        return self._observation
+    
+    def _build_observation(self) -> Observation:
+        """Build the observation for the current position"""
         return Observation(
             current_board=self.board,
             current_player=self.current_player,
@@ -469,7 +513,6 @@ class TicTacToeGameState:
     
     def generate_ai_move(self) -> Tuple[int, int]:
         """Generate AI's move using simple strategy"""
-        import random
         
         # First priority: Win if possible
         threats = self.get_threats()
@@ -502,6 +545,10 @@ class TicTacToeGameState:
         # Should never reach here if game is not over
         return 0, 0
     
+    def get_serialized_history(self) -> List[dict]:
+        """Get the game history as dicts, one per move"""
+        return list(self._history_dicts)
+    
     def get_state_for_api(self) -> dict:
         """Get the current game state formatted for API response"""
         return {
@@ -510,11 +557,12 @@ class TicTacToeGameState:
             "move_number": self.move_number,
             "game_over": self.game_over,
             "winner": self.winner,
-            "game_history": [move.dict() for move in self.game_history],
-            "available_moves": [move.dict() for move in self.get_available_moves()],
+            "game_history": self.get_serialized_history(),
+            "available_moves": [{"row": i, "col": j, "value": ""} for i, j in bitboard.CELLS
+                                if self.board[i][j] == ""],
             "statistics": {
                 "total_moves": self.move_number,
-                "player_moves": len([m for m in self.game_history if m.player == "player"]),
-                "ai_moves": len([m for m in self.game_history if m.player == "ai"])
+                "player_moves": self._moves_by_player["player"],
+                "ai_moves": self._moves_by_player["ai"]
             }
         } 
\ No newline at end of file
@@ -4,7 +4,7 @@ Multi-Agent Game Simulation using CrewAI + MCP
 """
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse, Response, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from sse_starlette import EventSourceResponse
 from pydantic import BaseModel
@@ -13,6 +13,8 @@ from contextlib import asynccontextmanager
 import uvicorn
 import os
 import json
+import orjson
+import fastjsonschema
 from datetime import datetime
 import asyncio
 import time
@@ -49,6 +51,7 @@ else:
 
 # Import MCP modules
 from game.mcp_coordinator import MCPGameCoordinator
+from agents.base_mcp_agent import llm_chunk_sink
 from agents.scout_local import ScoutMCPAgent
 from agents.strategist_local import StrategistMCPAgent
 from agents.executor_local import ExecutorMCPAgent
@@ -58,12 +61,14 @@ from agents.executor_langchain import ExecutorLangChain
 from models.registry import model_registry
 from models.factory import ModelFactory
 from models.shared_llm import SharedLLMConnection
+from utils.llm_pool import run_llm_call
 
 # Initialize FastAPI app
 app = FastAPI(
     title="MCP Protocol Tic Tac Toe",
     description="Multi-Agent Game Simulation using CrewAI + MCP Protocol",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -86,6 +91,18 @@ strategist_agent = None
 executor_agent = None
 distributed_mode = False
 
+# MCP registries bound once per agent after startup (static after registration)
+agent_registries: Dict[str, Dict[str, dict]] = {}
+
+# /health payload, rebuilt whenever startup changes the agent set
+health_payload: Dict[str, Any] = {
+    "status": "healthy",
+    "version": "2.0.0",
+    "architecture": "MCP + CrewAI Protocol",
+    "agents": {"scout": False, "strategist": False, "executor": False},
+    "coordinator": False
+}
+
 # Metrics are now handled by individual MCP agents via their tools
 
 # Pydantic models for API requests/responses
@@ -135,6 +152,7 @@ async def startup_event():
         print("   python agents/scout_server.py")
         print("   python agents/strategist_server.py")
         print("   python agents/executor_server.py")
+        _refresh_health_payload()
         return
 
     # LOCAL MODE: Create agents
@@ -235,6 +253,7 @@ async def startup_event():
     else:
         print(f"❌ Unknown agent framework: {agent_framework}")
         print("Available options: 'crewai', 'langchain'")
+        _refresh_health_payload()
         return
 
     print(f"🔍 Agent status: scout={scout_agent is not None}, strategist={strategist_agent is not None}, executor={executor_agent is not None}")
@@ -268,6 +287,10 @@ async def startup_event():
         if executor_agent:
             print("✅ Executor LangChain Agent ready (no MCP server needed)")
     
+    # Bind MCP registries once so requests skip per-call agent lookups
+    _bind_agent_registries()
+    _refresh_health_payload()
+
     # Set agents in coordinator (local mode only)
     if not distributed_mode:
         coordinator.set_agents(scout_agent, strategist_agent, executor_agent)
@@ -288,7 +311,7 @@ async def startup_event():
             # Quick model warmup only
             print("   📝 Basic model initialization...")
             warmup_prompt = "Hello, this is a quick warmup call."
-            await asyncio.to_thread(scout_agent.llm.call, warmup_prompt)
+            await run_llm_call(scout_agent.llm.call, warmup_prompt)
             
             print("✅ Light pre-warming completed - game is ready!")
             
@@ -312,60 +335,47 @@ async def startup_event():
 
     print("🎉 MCP CrewAI system initialized!")
 
-@app.get("/")
-async def root():
-    return {"message": "MCP CrewAI Tic Tac Toe Game", "version": "2.0.0"}
-
-@app.get("/mcp/{agent_id}")
-async def mcp_info_endpoint(agent_id: str):
-    """Full MCP discovery endpoint - returns tools, resources, and prompts"""
-    try:
-        # Get the agent
-        agent = None
-        if agent_id == "scout":
-            agent = scout_agent
-        elif agent_id == "strategist":
-            agent = strategist_agent
-        elif agent_id == "executor":
-            agent = executor_agent
-        else:
-            raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
+MCP_PROTOCOL_VERSION = "2024-11-05"
 
+def _bind_agent_registries():
+    """Capture each agent's registries and pre-serialize its static MCP listings"""
+    for agent_id, agent in (("scout", scout_agent), ("strategist", strategist_agent), ("executor", executor_agent)):
         if agent is None:
-            raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' not initialized")
+            agent_registries.pop(agent_id, None)
+            continue
+        # LangChain agents have no MCP registries (and use __slots__, so no __dict__)
+        agent_attrs = getattr(agent, '__dict__', {})
+        tools_registry = agent_attrs.get('tools_registry', {})
+        resources_registry = agent_attrs.get('resources_registry', {})
+        prompts_registry = agent_attrs.get('prompts_registry', {})
 
-        # Get tools registry from agent
-        tools_registry = agent.__dict__.get('tools_registry', {})
-        tools = []
-        for tool_name, tool_info in tools_registry.items():
-            tools.append({
+        tools = [
+            {
                 "name": tool_name,
                 "description": tool_info.get('description', ''),
                 "inputSchema": tool_info.get('inputSchema', {})
-            })
-
-        # Get resources registry from agent
-        resources_registry = agent.__dict__.get('resources_registry', {})
-        resources = []
-        for resource_uri, resource_info in resources_registry.items():
-            resources.append({
+            }
+            for tool_name, tool_info in tools_registry.items()
+        ]
+        resources = [
+            {
                 "uri": resource_uri,
                 "name": resource_info.get('name', ''),
                 "description": resource_info.get('description', ''),
                 "mimeType": resource_info.get('mimeType', 'text/plain')
-            })
-
-        # Get prompts registry from agent
-        prompts_registry = agent.__dict__.get('prompts_registry', {})
-        prompts = []
-        for prompt_name, prompt_info in prompts_registry.items():
-            prompts.append({
+            }
+            for resource_uri, resource_info in resources_registry.items()
+        ]
+        prompts = [
+            {
                 "name": prompt_name,
                 "description": prompt_info.get('description', ''),
                 "arguments": prompt_info.get('arguments', [])
-            })
+            }
+            for prompt_name, prompt_info in prompts_registry.items()
+        ]
 
-        return {
+        discovery = {
             "jsonrpc": "2.0",
             "result": {
                 "serverInfo": {
@@ -384,14 +394,70 @@ async def mcp_info_endpoint(agent_id: str):
             }
         }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        agent_registries[agent_id] = {
+            "tools": tools_registry,
+            "resources": resources_registry,
+            "prompts": prompts_registry,
+            # Registries are static after startup, so listings are serialized once
+            "discovery_bytes": orjson.dumps(discovery),
+            "tools_list_bytes": orjson.dumps({"tools": tools}),
+            "resources_list_bytes": orjson.dumps({"resources": resources}),
+            "prompts_list_bytes": orjson.dumps({"prompts": prompts}),
+            "initialize_bytes": orjson.dumps({
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {"tools": {}, "resources": {}, "prompts": {}},
+                "serverInfo": {"name": f"{agent_id}-mcp-server", "version": "1.0.0"}
+            })
+        }
 
-@app.post("/mcp/{agent_id}")
-async def mcp_tool_call(agent_id: str, request: dict):
-    """MCP Inspector endpoint - call a tool on a specific agent"""
+def _refresh_health_payload():
+    """Rebuild the static /health payload from the current agents"""
+    global health_payload
+    health_payload = {
+        "status": "healthy",
+        "version": "2.0.0",
+        "architecture": "MCP + CrewAI Protocol",
+        "agents": {
+            "scout": scout_agent is not None,
+            "strategist": strategist_agent is not None,
+            "executor": executor_agent is not None
+        },
+        "coordinator": coordinator is not None
+    }
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush the scout's analysis store and release the LLM clients' pooled connections"""
+    if isinstance(scout_agent, ScoutMCPAgent):
+        await scout_agent.aclose()
+    await ModelFactory.aclose()
+
+# Pre-encoded JSON-RPC error responses; callers fill in the id (JSON-encoded)
+# and the message text (escaped via _json_text)
+_ERR_PARSE = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":"Parse error: %b"}}'
+_ERR_INVALID_REQUEST = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32600,"message":"Invalid Request"}}'
+_ERR_METHOD_NOT_SUPPORTED = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32601,"message":"Method \'%b\' not supported"}}'
+_ERR_TOOL_NOT_FOUND = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32601,"message":"Tool \'%b\' not found"}}'
+_ERR_RESOURCE_NOT_FOUND = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32602,"message":"Resource \'%b\' not found"}}'
+_ERR_INVALID_PARAMS = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32602,"message":"Invalid params: %b"}}'
+_ERR_PROMPT_NOT_FOUND = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32602,"message":"Prompt \'%b\' not found"}}'
+_ERR_INTERNAL = b'{"jsonrpc":"2.0","id":%b,"error":{"code":-32603,"message":"%b"}}'
+
+def _json_text(value) -> bytes:
+    """Escape a value's text for embedding inside a JSON string template"""
+    return orjson.dumps(str(value))[1:-1]
+
+def _rpc_result_bytes(request_id, result_bytes: bytes) -> bytes:
+    """Wrap a pre-serialized JSON-RPC result without re-encoding it"""
+    return b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id) + b',"result":' + result_bytes + b'}'
+
+@app.get("/")
+async def root():
+    return {"message": "MCP CrewAI Tic Tac Toe Game", "version": "2.0.0"}
+
+@app.get("/mcp/{agent_id}", response_class=ORJSONResponse)
+async def mcp_info_endpoint(agent_id: str):
+    """Full MCP discovery endpoint - returns tools, resources, and prompts"""
     try:
         # Get the agent
         agent = None
@@ -403,190 +469,267 @@ async def mcp_tool_call(agent_id: str, request: dict):
             agent = executor_agent
         else:
             raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
-        
+
         if agent is None:
             raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' not initialized")
-        
-        # Extract tool name and arguments from MCP request
-        method = request.get("method")
-        params = request.get("params", {})
-        
-        if method == "tools/list":
-            # Return list of tools
-            tools_registry = agent.__dict__.get('tools_registry', {})
-            tools = []
-            for tool_name, tool_info in tools_registry.items():
-                tools.append({
-                    "name": tool_name,
-                    "description": tool_info.get('description', ''),
-                    "inputSchema": tool_info.get('inputSchema', {})
-                })
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {"tools": tools}
-            }
-        
-        elif method == "resources/list":
-            # List resources
-            resources_registry = agent.__dict__.get('resources_registry', {})
-            resources = []
-            for resource_uri, resource_info in resources_registry.items():
-                resources.append({
-                    "uri": resource_uri,
-                    "name": resource_info.get('name', ''),
-                    "description": resource_info.get('description', ''),
-                    "mimeType": resource_info.get('mimeType', 'text/plain')
-                })
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {"resources": resources}
-            }
-        
-        elif method == "resources/read":
-            # Read a specific resource
-            uri = params.get("uri")
-            resources_registry = agent.__dict__.get('resources_registry', {})
-            
-            if uri not in resources_registry:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {
-                        "code": -32602,
-                        "message": f"Resource '{uri}' not found"
-                    }
-                }
-            
-            getter = resources_registry[uri]['getter']
-            content = await getter()
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {
-                    "contents": [
-                        {
-                            "uri": uri,
-                            "mimeType": resources_registry[uri]['mimeType'],
-                            "text": json.dumps(content, default=str)
-                        }
-                    ]
-                }
-            }
-        
-        elif method == "prompts/list":
-            # List prompts
-            prompts_registry = agent.__dict__.get('prompts_registry', {})
-            prompts = []
-            for prompt_name, prompt_info in prompts_registry.items():
-                prompts.append({
-                    "name": prompt_name,
-                    "description": prompt_info.get('description', ''),
-                    "arguments": prompt_info.get('arguments', [])
-                })
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {"prompts": prompts}
-            }
-        
-        elif method == "prompts/get":
-            # Get a specific prompt
-            prompt_name = params.get("name")
-            prompt_args = params.get("arguments", {})
-            prompts_registry = agent.__dict__.get('prompts_registry', {})
-            
-            if prompt_name not in prompts_registry:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {
-                        "code": -32602,
-                        "message": f"Prompt '{prompt_name}' not found"
-                    }
-                }
-            
-            generator = prompts_registry[prompt_name]['generator']
-            messages = await generator(prompt_args)
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {
-                    "messages": [
-                        {
-                            "role": messages.role,
-                            "content": messages.content
-                        }
-                    ]
-                }
-            }
-        
-        elif method == "tools/call":
-            # Call a specific tool
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            tools_registry = agent.__dict__.get('tools_registry', {})
-            if tool_name not in tools_registry:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {
-                        "code": -32601,
-                        "message": f"Tool '{tool_name}' not found"
-                    }
+
+        return Response(
+            content=agent_registries[agent_id]["discovery_bytes"],
+            media_type="application/json"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _call_tool(tool_info: Dict[str, Any], arguments: Dict[str, Any]):
+    """Invoke a registered tool handler"""
+    # Call handler with arguments if it accepts them, otherwise call without
+    if tool_info['needs_args']:
+        return await tool_info['handler'](arguments)
+    return await tool_info['handler']()
+
+async def _handle_initialize(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Answer the MCP handshake with the agent's precomputed server info"""
+    return _rpc_result_bytes(request_id, registries["initialize_bytes"])
+
+async def _handle_tools_list(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Return the cached tool listing"""
+    return _rpc_result_bytes(request_id, registries["tools_list_bytes"])
+
+async def _handle_resources_list(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Return the cached resource listing"""
+    return _rpc_result_bytes(request_id, registries["resources_list_bytes"])
+
+async def _handle_prompts_list(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Return the cached prompt listing"""
+    return _rpc_result_bytes(request_id, registries["prompts_list_bytes"])
+
+async def _handle_resources_read(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Read a specific resource"""
+    uri = params.get("uri")
+    resources_registry = registries["resources"]
+    
+    if uri not in resources_registry:
+        return _ERR_RESOURCE_NOT_FOUND % (orjson.dumps(request_id), _json_text(uri))
+    
+    getter = resources_registry[uri]['getter']
+    content = await getter()
+    
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "contents": [
+                {
+                    "uri": uri,
+                    "mimeType": resources_registry[uri]['mimeType'],
+                    "text": orjson.dumps(content).decode()
                 }
-            
-            # Execute the tool
-            handler = tools_registry[tool_name]['handler']
-            # Call handler with arguments if it accepts them, otherwise call without
-            import inspect
-            sig = inspect.signature(handler)
-            if len(sig.parameters) > 0:
-                result = await handler(arguments)
-            else:
-                result = await handler()
-            
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(result)
-                        }
-                    ]
+            ]
+        }
+    })
+
+async def _handle_prompts_get(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Get a specific prompt"""
+    prompt_name = params.get("name")
+    prompt_args = params.get("arguments", {})
+    prompts_registry = registries["prompts"]
+    
+    if prompt_name not in prompts_registry:
+        return _ERR_PROMPT_NOT_FOUND % (orjson.dumps(request_id), _json_text(prompt_name))
+    
+    generator = prompts_registry[prompt_name]['generator']
+    messages = await generator(prompt_args)
+    
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "messages": [
+                {
+                    "role": messages.role,
+                    "content": messages.content
                 }
-            }
-        
-        else:
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32601,
-                    "message": f"Method '{method}' not supported"
+            ]
+        }
+    })
+
+async def _handle_tools_call(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Call a specific tool"""
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    
+    tools_registry = registries["tools"]
+    if tool_name not in tools_registry:
+        return _ERR_TOOL_NOT_FOUND % (orjson.dumps(request_id), _json_text(tool_name))
+    
+    tool_info = tools_registry[tool_name]
+    try:
+        tool_info['validator'](arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return _ERR_INVALID_PARAMS % (orjson.dumps(request_id), _json_text(e.message))
+    
+    # Execute the tool
+    result = await _call_tool(tool_info, arguments)
+    
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": [
+                {
+                    "type": "text",
+                    "text": orjson.dumps(result).decode()
                 }
-            }
+            ]
+        }
+    })
+
+async def _handle_tools_call_many(registries: Dict[str, Any], params: Dict[str, Any], request_id) -> bytes:
+    """Run independent tool calls concurrently within one request"""
+    calls = params.get("calls", [])
+    tools_registry = registries["tools"]
+    missing = [call.get("name") for call in calls if call.get("name") not in tools_registry]
+    if missing:
+        return _ERR_TOOL_NOT_FOUND % (orjson.dumps(request_id), _json_text(", ".join(map(str, missing))))
     
-    except HTTPException:
-        raise
+    # Reject the whole batch before starting any call if one has bad arguments
+    try:
+        for call in calls:
+            tools_registry[call["name"]]['validator'](call.get("arguments", {}))
+    except fastjsonschema.JsonSchemaException as e:
+        return _ERR_INVALID_PARAMS % (orjson.dumps(request_id), _json_text(f"{call['name']}: {e.message}"))
+    
+    # A failing call must not cancel its siblings (in-flight LLM calls); it gets its own error entry
+    outcomes = await asyncio.gather(
+        *(_call_tool(tools_registry[call["name"]], call.get("arguments", {})) for call in calls),
+        return_exceptions=True
+    )
+    
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {"results": [_call_many_entry(outcome) for outcome in outcomes]}
+    })
+
+def _call_many_entry(outcome) -> Dict[str, Any]:
+    """One tools/call_many result: the tool's content, or an error for that call alone"""
+    # CancelledError is a BaseException, not an Exception
+    if isinstance(outcome, BaseException):
+        return {"error": {"code": -32603, "message": str(outcome) or type(outcome).__name__}}
+    try:
+        text = orjson.dumps(outcome).decode()
+    except TypeError as e:
+        return {"error": {"code": -32603, "message": f"Result not serializable: {e}"}}
+    return {"content": [{"type": "text", "text": text}]}
+
+# JSON-RPC method name -> handler(registries, params, request_id)
+MCP_METHOD_HANDLERS = {
+    "initialize": _handle_initialize,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+    "tools/call_many": _handle_tools_call_many,
+    "resources/list": _handle_resources_list,
+    "resources/read": _handle_resources_read,
+    "prompts/list": _handle_prompts_list,
+    "prompts/get": _handle_prompts_get,
+}
+
+async def _dispatch_mcp_request(agent_id: str, request: Dict[str, Any]) -> bytes:
+    """Handle a single JSON-RPC request for an agent and return the encoded response"""
+    if not isinstance(request, dict):
+        return _ERR_INVALID_REQUEST
+    
+    method = request.get("method")
+    handler = MCP_METHOD_HANDLERS.get(method)
+    if handler is None:
+        return _ERR_METHOD_NOT_SUPPORTED % (orjson.dumps(request.get("id")), _json_text(method))
+    
+    try:
+        return await handler(agent_registries[agent_id], request.get("params", {}), request.get("id"))
     except Exception as e:
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id", 1),
-            "error": {
-                "code": -32603,
-                "message": str(e)
-            }
-        }
+        return _ERR_INTERNAL % (orjson.dumps(request.get("id", 1)), _json_text(e))
+
+@app.post("/mcp/{agent_id}")
+async def mcp_tool_call(agent_id: str, request: Request):
+    """MCP Inspector endpoint - call a tool on a specific agent
+
+    Accepts a single JSON-RPC request or a JSON-RPC batch (array); batched
+    requests are dispatched concurrently and answered with an array.
+    """
+    # Get the agent
+    agent = None
+    if agent_id == "scout":
+        agent = scout_agent
+    elif agent_id == "strategist":
+        agent = strategist_agent
+    elif agent_id == "executor":
+        agent = executor_agent
+    else:
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
+    
+    if agent is None:
+        raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' not initialized")
+    
+    # Decode the raw body with orjson rather than Starlette's stdlib json path
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        return Response(content=_ERR_PARSE % _json_text(e), media_type="application/json")
+    
+    if body == []:
+        # JSON-RPC 2.0: an empty batch is answered with a single Invalid Request error
+        content = _ERR_INVALID_REQUEST
+    elif isinstance(body, list):
+        # Non-object members are answered with Invalid Request by _dispatch_mcp_request
+        responses = await asyncio.gather(*(_dispatch_mcp_request(agent_id, r) for r in body))
+        content = b"[" + b",".join(responses) + b"]"
+    else:
+        content = await _dispatch_mcp_request(agent_id, body)
+    
+    return Response(content=content, media_type="application/json")
+
+@app.post("/mcp/{agent_id}/stream")
+async def mcp_tool_call_stream(agent_id: str, request: Request):
+    """Streaming variant of the MCP endpoint for a single JSON-RPC request
+
+    Answers with server-sent events: a "thinking" event per LLM text chunk
+    while the tool runs, then "tool_result" carrying the JSON-RPC response
+    and a final "done".
+    """
+    if agent_id not in ("scout", "strategist", "executor"):
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
+    if agent_id not in agent_registries:
+        raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' not initialized")
+    
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        return Response(content=_ERR_PARSE % _json_text(e), media_type="application/json")
+    
+    chunks: asyncio.Queue = asyncio.Queue()
+    
+    async def dispatch() -> bytes:
+        # Set inside the task so only this request's LLM calls feed the queue
+        llm_chunk_sink.set(chunks.put)
+        return await _dispatch_mcp_request(agent_id, body)
+    
+    async def events():
+        task = asyncio.create_task(dispatch())
+        task.add_done_callback(lambda _: chunks.put_nowait(None))
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield {"event": "thinking", "data": chunk}
+            yield {"event": "tool_result", "data": (await task).decode()}
+            yield {"event": "done", "data": ""}
+        finally:
+            # Client went away mid-call
+            task.cancel()
+    
+    # EventSourceResponse sends keep-alive pings and disables proxy buffering
+    return EventSourceResponse(events())
 
 @app.get("/state")
 async def get_game_state():
@@ -598,7 +741,7 @@ async def get_game_state():
             "move_number": coordinator.game_state.move_number,
             "game_over": coordinator.game_state.game_over,
             "winner": coordinator.game_state.winner,
-            "game_history": [move.model_dump() for move in coordinator.game_state.game_history]
+            "game_history": coordinator.game_state.get_serialized_history()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting game state: {str(e)}")
@@ -749,7 +892,8 @@ async def get_available_models():
     """Get available models for switching"""
     try:
         from models.registry import model_registry
-        return {"models": model_registry.get_model_info()}
+        # Ollama status checks shell out to the ollama CLI; keep them off the event loop
+        return {"models": await asyncio.to_thread(model_registry.get_model_info)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting models: {str(e)}")
 
@@ -875,20 +1019,10 @@ async def get_agent_metrics(agent_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting agent metrics: {str(e)}")
 
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy", 
-        "version": "2.0.0",
-        "architecture": "MCP + CrewAI Protocol",
-        "agents": {
-            "scout": scout_agent is not None,
-            "strategist": strategist_agent is not None,
-            "executor": executor_agent is not None
-        },
-        "coordinator": coordinator is not None
-    }
+    return ORJSONResponse(health_payload)
 
 if __name__ == "__main__":
     from utils.config import config
@@ -896,11 +1030,8 @@ if __name__ == "__main__":
     # Get API config from config file
     api_config = config.get_api_config()
     
-    # Manually call startup to ensure agents are initialized
-    import asyncio
-    print("🚀 Manually initializing agents...")
-    asyncio.run(startup_event())
-    
+    # Agents are created by startup_event inside the server's own event loop;
+    # initializing them here would build a second set on a loop that is discarded
     uvicorn.run(
         "main:app",
         host=api_config.get('host', '0.0.0.0'),
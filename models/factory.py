@@ -1,4 +1,7 @@
-from typing import Optional
+import hashlib
+import os
+from typing import Dict, Optional, Tuple
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_community.llms import Ollama
@@ -6,17 +9,65 @@ from langchain_community.chat_models import ChatLiteLLM
 from .registry import ModelConfig, ModelProvider, model_registry
 
 
+# Environment variable holding each provider's API key
+_API_KEY_ENV = {
+    ModelProvider.OPENAI: "OPENAI_API_KEY",
+    ModelProvider.ANTHROPIC: "ANTHROPIC_API_KEY"
+}
+
+# Pooled HTTP clients for every OpenAI client the factory creates, so calls
+# reuse keep-alive TLS connections instead of handshaking per client
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+
+def _new_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Fresh sync and async pooled clients"""
+    return (
+        httpx.Client(limits=_HTTP_LIMITS, timeout=httpx.Timeout(30.0)),
+        httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=httpx.Timeout(30.0))
+    )
+
+
+_http_client, _http_async_client = _new_http_clients()
+
+
 class ModelFactory:
     """Factory for creating LLM instances from model configurations"""
     
+    # Process-wide LLM clients keyed by (model name, API key hash), so every
+    # agent (and every re-created agent) reuses one client and connection pool
+    _llm_cache: Dict[Tuple[str, str], object] = {}
+    
     @staticmethod
     def create_llm(model_name: str) -> Optional[object]:
-        """Create an LLM instance from a model name"""
+        """Get the shared LLM instance for a model name, creating it on first use"""
         model_config = model_registry.get_model(model_name)
         if not model_config or not model_config.is_available:
             return None
         
-        return ModelFactory._create_llm_from_config(model_config)
+        # A rotated API key gets a fresh client
+        api_key = os.getenv(_API_KEY_ENV.get(model_config.provider, ""), "")
+        key = (model_name, hashlib.sha256(api_key.encode()).hexdigest())
+        llm = ModelFactory._llm_cache.get(key)
+        if llm is None:
+            llm = ModelFactory._create_llm_from_config(model_config)
+            # Failed creations are not cached so a later call can retry
+            if llm is not None:
+                ModelFactory._llm_cache[key] = llm
+        return llm
+    
+    @staticmethod
+    async def aclose():
+        """Close the pooled HTTP clients at app shutdown
+
+        Cached LLMs hold the closed clients, so the cache is dropped and new
+        clients are opened for any later app lifespan in the same process.
+        """
+        global _http_client, _http_async_client
+        ModelFactory._llm_cache.clear()
+        await _http_async_client.aclose()
+        _http_client.close()
+        _http_client, _http_async_client = _new_http_clients()
     
     @staticmethod
     def create_llm_from_config(model_config: ModelConfig) -> Optional[object]:
@@ -31,13 +82,17 @@ class ModelFactory:
                 # For newer models, don't use max_tokens or temperature parameters
                 if 'gpt-5' in model_config.model_id or 'gpt-4o' in model_config.model_id:
                     return ChatOpenAI(
-                        model=model_config.model_id
+                        model=model_config.model_id,
+                        http_client=_http_client,
+                        http_async_client=_http_async_client
                     )
                 else:
                     return ChatOpenAI(
                         model=model_config.model_id,
                         temperature=model_config.temperature,
-                        max_completion_tokens=model_config.max_tokens
+                        max_completion_tokens=model_config.max_tokens,
+                        http_client=_http_client,
+                        http_async_client=_http_async_client
                     )
             
             elif model_config.provider == ModelProvider.ANTHROPIC:
@@ -435,11 +435,10 @@ class ModelRegistry:
         if is_available:
             return ""
         
-        if model.provider == ModelProvider.OPENAI:
-            return "OpenAI API key not found in environment variables"
-        elif model.provider == ModelProvider.ANTHROPIC:
-            return "Anthropic API key not found in environment variables"
-        elif model.provider == ModelProvider.OLLAMA:
+        reason = _API_KEY_REASONS.get(model.provider)
+        if reason:
+            return reason
+        if model.provider == ModelProvider.OLLAMA:
             # Get lifecycle status for better hints
             lifecycle_status = model._check_ollama_model_status()
             
@@ -453,5 +452,12 @@ class ModelRegistry:
             return "Unknown error"
 
 
+# Unavailability reasons that depend only on the provider
+_API_KEY_REASONS = {
+    ModelProvider.OPENAI: "OpenAI API key not found in environment variables",
+    ModelProvider.ANTHROPIC: "Anthropic API key not found in environment variables"
+}
+
+
 # Global registry instance
 model_registry = ModelRegistry() 
\ No newline at end of file
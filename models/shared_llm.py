@@ -5,11 +5,170 @@ Provides a single LLM connection instance shared across all agents
 to reduce initialization overhead and improve resource utilization
 """
 
-from typing import Optional
+import asyncio
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import httpx
+from langchain_core.caches import BaseCache, InMemoryCache
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_community.llms import Ollama
 
+# Optional semantic (embedding) cache dependencies
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+_AVAILABLE_MOVES = re.compile(r"(Available Moves: )(\[[\d,\s\[\]]*\])")
+
+
+class SemanticCache(BaseCache):
+    """
+    Two-level LLM response cache: exact match, then nearest prompt
+
+    L1 is the exact-match InMemoryCache. On an L1 miss the prompt is
+    embedded and looked up in a per-model FAISS inner-product index of
+    normalized vectors (cosine similarity); a neighbour scoring at least
+    `threshold` is returned as a hit. Available-move lists are sorted before
+    embedding so ordering alone never causes a miss. Every fresh response
+    is written to both levels.
+    """
+
+    def __init__(self, exact_cache: InMemoryCache, model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 threshold: float = 0.98, maxsize: int = 4096):
+        self.exact_cache = exact_cache
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.encoder = SentenceTransformer(model_name)
+        self.dimension = self.encoder.get_sentence_embedding_dimension()
+        # One index per llm_string so different models never share answers
+        self._indexes: Dict[str, Any] = {}
+        self._responses: Dict[str, List[Sequence]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        """Sort embedded available-move lists so ordering does not matter"""
+        def sort_moves(match):
+            try:
+                moves = sorted(json.loads(match.group(2)))
+            except ValueError:
+                return match.group(0)
+            return match.group(1) + json.dumps(moves)
+        return _AVAILABLE_MOVES.sub(sort_moves, prompt)
+
+    def _embed(self, prompt: str):
+        """Embed a prompt as a normalized float32 row vector"""
+        return self.encoder.encode(
+            [self._normalize(prompt)], normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence]:
+        """Look up a response by exact prompt, then by nearest embedding"""
+        cached = self.exact_cache.lookup(prompt, llm_string)
+        if cached is not None:
+            return cached
+
+        index = self._indexes.get(llm_string)
+        if index is None or index.ntotal == 0:
+            return None
+        vector = self._embed(prompt)
+        with self._lock:
+            scores, ids = index.search(vector, 1)
+            if ids[0][0] < 0 or scores[0][0] < self.threshold:
+                return None
+            return self._responses[llm_string][ids[0][0]]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence) -> None:
+        """Store a fresh response in both cache levels"""
+        self.exact_cache.update(prompt, llm_string, return_val)
+        vector = self._embed(prompt)
+        with self._lock:
+            index = self._indexes.get(llm_string)
+            if index is None or index.ntotal >= self.maxsize:
+                # IndexFlatIP has no eviction; start over once full
+                index = self._indexes[llm_string] = faiss.IndexFlatIP(self.dimension)
+                self._responses[llm_string] = []
+            index.add(vector)
+            self._responses[llm_string].append(return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Clear both cache levels"""
+        self.exact_cache.clear()
+        with self._lock:
+            self._indexes.clear()
+            self._responses.clear()
+
+
+class BatchedLLMClient:
+    """
+    Coalesces concurrent ainvoke calls into llm.abatch dispatches
+
+    Calls arriving within `window` seconds are sent together (up to
+    `max_batch` per dispatch) so concurrent games share request overhead
+    and the backend sees them as one burst. Only ainvoke is supported;
+    LangChain chains should keep using the raw connection.
+    """
+
+    def __init__(self, llm, window: float = 0.005, max_batch: int = 32, max_concurrency: int = 16):
+        self.llm = llm
+        self.window = window
+        self.max_batch = max_batch
+        self._config = {"max_concurrency": max_concurrency}
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def ainvoke(self, input: Any) -> Any:
+        """Queue one input and wait for its result from the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Dispatch everything queued so far in max_batch-sized chunks"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            task = asyncio.create_task(self._dispatch(pending[start:start + self.max_batch]))
+            # Keep a reference until done so the task is not garbage collected
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run one batch and resolve each caller's future"""
+        try:
+            results = await self.llm.abatch(
+                [input for input, _ in batch], config=self._config, return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            # Callers that timed out have already cancelled their future
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
 
 class SharedLLMConnection:
     """
@@ -29,28 +188,59 @@ class SharedLLMConnection:
         self.model_name = model_name
         self.llm = None
         self.connection_count = 0
+        self.batched_llm = None
+        # Exact-match prompt cache shared by every agent on this connection;
+        # board prompts repeat heavily within and across games
+        self.response_cache = InMemoryCache(maxsize=4096)
+        # Opt-in L2 cache for near-duplicate prompts (SEMANTIC_CACHE=1); a
+        # neighbouring board can need a different move, so it stays off by default
+        if SEMANTIC_CACHE_AVAILABLE and os.getenv("SEMANTIC_CACHE", "0") == "1":
+            self.response_cache = SemanticCache(self.response_cache)
+        # One pooled client for all agents, sized for concurrent in-flight calls
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=512, max_keepalive_connections=256, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(30.0)
+        )
         self._initialize_llm()
 
     def _initialize_llm(self):
-        """Initialize shared LLM connection based on model name"""
+        """Initialize shared LLM connection based on model name
+
+        Every agent on this connection asks for JSON, so responses are
+        requested deterministic (temperature 0) and in JSON mode where the
+        backend supports it; deterministic answers are what make
+        response_cache hits valid.
+        """
         try:
             if "gpt" in self.model_name.lower():
-                # OpenAI models
-                self.llm = ChatOpenAI(model=self.model_name, timeout=30.0)
+                # OpenAI models; gpt-5 reasoning models only accept the default temperature
+                sampling = {} if "gpt-5" in self.model_name.lower() else {"temperature": 0}
+                self.llm = ChatOpenAI(
+                    model=self.model_name,
+                    timeout=30.0,
+                    cache=self.response_cache,
+                    http_async_client=self.http_client,
+                    model_kwargs={"response_format": {"type": "json_object"}},
+                    **sampling
+                )
                 print(f"✅ Shared LLM connection initialized: OpenAI {self.model_name}")
             elif "claude" in self.model_name.lower():
                 # Anthropic models
-                self.llm = ChatAnthropic(model=self.model_name, timeout=30.0)
+                self.llm = ChatAnthropic(model=self.model_name, timeout=30.0, temperature=0, cache=self.response_cache)
                 print(f"✅ Shared LLM connection initialized: Anthropic {self.model_name}")
             else:
                 # Local models via Ollama
-                self.llm = Ollama(model=self.model_name, timeout=30.0)
+                self.llm = Ollama(
+                    model=self.model_name, timeout=30.0, temperature=0, format="json", cache=self.response_cache
+                )
                 print(f"✅ Shared LLM connection initialized: Ollama {self.model_name}")
         except Exception as e:
             print(f"❌ Failed to initialize shared LLM: {e}")
             # Fallback to Ollama with smallest model
             try:
-                self.llm = Ollama(model="llama3.2:1b", timeout=30.0)
+                self.llm = Ollama(
+                    model="llama3.2:1b", timeout=30.0, temperature=0, format="json", cache=self.response_cache
+                )
                 self.model_name = "llama3.2:1b"
                 print(f"✅ Fallback to Ollama llama3.2:1b")
             except Exception as fallback_error:
@@ -67,6 +257,18 @@ class SharedLLMConnection:
         self.connection_count += 1
         return self.llm
 
+    def get_batched_connection(self) -> BatchedLLMClient:
+        """
+        Get the shared LLM behind a batching ainvoke front end
+
+        Returns:
+            A BatchedLLMClient wrapping the shared LLM instance
+        """
+        if self.batched_llm is None:
+            self.batched_llm = BatchedLLMClient(self.llm)
+        self.connection_count += 1
+        return self.batched_llm
+
     def release_connection(self):
         """
         Release LLM connection (decrements usage counter)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Build the compiled extensions in place: the minimax solver
+(agents/_minimax.pyx) and the bitboard line kernels (game/_bitboard.pyx)
+
+Requires Cython and a C compiler. Without the extensions, MinimaxMoveTable
+and game.bitboard fall back to their pure-Python code.
+
+Usage: python scripts/build_minimax.py
+"""
+import os
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    """Main function"""
+    os.chdir(ROOT)
+    extra_compile_args = [] if sys.platform == "win32" else ["-O3", "-march=native"]
+    setup(
+        name="mcp-game-minimax",
+        ext_modules=cythonize(
+            [
+                Extension("agents._minimax", ["agents/_minimax.pyx"], extra_compile_args=extra_compile_args),
+                Extension("game._bitboard", ["game/_bitboard.pyx"], extra_compile_args=extra_compile_args)
+            ]
+        ),
+        script_args=["build_ext", "--inplace"]
+    )
+
+
+if __name__ == "__main__":
+    main()
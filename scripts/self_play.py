@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Self-Play Evaluation Driver
+Plays many games of a random X against OptimizedLocalCoordinator (O)
+
+Games are spread over a process pool rather than threads: minimax lookups
+and LangChain's per-call bookkeeping are CPU-bound and would serialize on
+the GIL. Each worker builds its own coordinator (and SharedLLMConnection),
+so with --llm all workers send requests to the same Ollama server, which
+batches them.
+
+On a free-threaded CPython build (3.13t) threads no longer serialize, so
+ProcessPoolExecutor can be swapped for ThreadPoolExecutor (with one
+coordinator and event loop per thread) to avoid the per-process startup.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.optimized_local_agents import OptimizedLocalCoordinator
+
+WIN_LINES = [
+    [(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)], [(2, 0), (2, 1), (2, 2)],
+    [(0, 0), (1, 0), (2, 0)], [(0, 1), (1, 1), (2, 1)], [(0, 2), (1, 2), (2, 2)],
+    [(0, 0), (1, 1), (2, 2)], [(0, 2), (1, 1), (2, 0)]
+]
+
+# Per-worker state, created once by _init_worker
+_coordinator = None
+_loop = None
+
+
+def _init_worker(model_name: str, use_llm_pipeline: bool):
+    """Build this worker's coordinator and event loop"""
+    global _coordinator, _loop
+    _coordinator = OptimizedLocalCoordinator(model_name, use_llm_pipeline=use_llm_pipeline)
+    _loop = asyncio.new_event_loop()
+    # Creates the LLM tasks (and primes the model with --llm); without it every move is a fallback
+    _loop.run_until_complete(_coordinator.warmup())
+
+
+def _winner(board: List[List[str]]) -> Optional[str]:
+    """Return the winning symbol, if any"""
+    for (r1, c1), (r2, c2), (r3, c3) in WIN_LINES:
+        if board[r1][c1] and board[r1][c1] == board[r2][c2] == board[r3][c3]:
+            return board[r1][c1]
+    return None
+
+
+def _play_game(seed: int) -> Dict:
+    """Play one game; X moves at random (seeded), O asks the coordinator"""
+    rng = random.Random(seed)
+    board = [["", "", ""] for _ in range(3)]
+    ai_time = 0.0
+
+    for turn in range(9):
+        if turn % 2 == 0:
+            empty = [(i, j) for i in range(3) for j in range(3) if board[i][j] == ""]
+            row, col = rng.choice(empty)
+            board[row][col] = "X"
+        else:
+            start = time.perf_counter()
+            result = _loop.run_until_complete(_coordinator.get_ai_move({"board": board}))
+            ai_time += time.perf_counter() - start
+            if "error" in result:
+                return {"seed": seed, "winner": None, "error": result["error"], "ai_time": ai_time}
+            move = result["move"]
+            board[move["row"]][move["col"]] = "O"
+
+        winner = _winner(board)
+        if winner:
+            return {"seed": seed, "winner": winner, "ai_time": ai_time}
+
+    return {"seed": seed, "winner": "draw", "ai_time": ai_time}
+
+
+def run_games(n: int, workers: Optional[int] = None, model_name: str = "llama3.2:1b",
+              use_llm_pipeline: bool = False) -> List[Dict]:
+    """Play n games across a process pool and return one result per game"""
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(model_name, use_llm_pipeline)
+    ) as pool:
+        return list(pool.map(_play_game, range(n)))
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Self-play evaluation for OptimizedLocalCoordinator")
+    parser.add_argument("games", type=int, nargs="?", default=100, help="number of games")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: CPU count)")
+    parser.add_argument("--model", default="llama3.2:1b", help="model for the LLM pipeline")
+    parser.add_argument("--llm", action="store_true", help="use the LLM pipeline instead of the minimax table")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_games(args.games, args.workers, args.model, args.llm)
+    duration = time.perf_counter() - start
+
+    tally = {"X": 0, "O": 0, "draw": 0, None: 0}
+    for result in results:
+        tally[result["winner"]] += 1
+    ai_time = sum(result["ai_time"] for result in results)
+
+    print(f"Games: {len(results)} in {duration:.2f}s")
+    print(f"   O wins: {tally['O']}, X wins: {tally['X']}, draws: {tally['draw']}, errors: {tally[None]}")
+    print(f"   AI time: {ai_time:.3f}s total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Tests for the bitboard evaluator in game/bitboard.py
+
+Checked exhaustively: a 3x3 board has only 3^9 = 19683 cell assignments.
+"""
+from itertools import product
+
+import pytest
+
+from game import bitboard
+
+ALL_BOARDS = [
+    [list(cells[0:3]), list(cells[3:6]), list(cells[6:9])]
+    for cells in product(("X", "O", ""), repeat=9)
+]
+
+
+def _cell(move):
+    return move["row"], move["col"]
+
+
+def _wins(board, player):
+    return any(all(board[i][j] == player for i, j in (divmod(c, 3) for c in line)) for line in bitboard.WIN_LINES)
+
+
+def _completing_cells(board, player):
+    """Empty cells where player would complete a line, by trying each one (board must be undecided)"""
+    cells = []
+    for i, j in bitboard.CELLS:
+        if board[i][j] == "":
+            board[i][j] = player
+            if _wins(board, player):
+                cells.append((i, j))
+            board[i][j] = ""
+    return cells
+
+
+def test_win_masks_match_win_lines():
+    for line, mask in zip(bitboard.WIN_LINES, bitboard.WIN_MASKS):
+        assert bitboard.mask_cells(mask) == [{"row": c // 3, "col": c % 3} for c in line]
+
+
+def test_mask_cells_is_row_major():
+    assert bitboard.mask_cells(0) == []
+    assert [_cell(m) for m in bitboard.mask_cells(bitboard.FULL_MASK)] == list(bitboard.CELLS)
+
+
+def test_board_masks_partition_the_board():
+    for board in ALL_BOARDS[::97]:
+        masks = bitboard.board_masks(board)
+        assert masks["X"] | masks["O"] | masks[""] == bitboard.FULL_MASK
+        assert masks["X"] & masks["O"] == 0
+        assert masks[""] == bitboard.empty_mask(board)
+
+
+def test_threats_and_opportunities_match_brute_force():
+    for board in ALL_BOARDS:
+        if _wins(board, "X") or _wins(board, "O"):
+            continue
+        analysis = bitboard.analyze_board(board)
+        assert [_cell(m) for m in analysis["threats"]] == _completing_cells(board, "X")
+        assert [_cell(m) for m in analysis["opportunities"]] == _completing_cells(board, "O")
+
+
+def test_cached_analysis_matches_analyze_board_on_every_board():
+    for board in ALL_BOARDS:
+        assert bitboard.cached_analysis(board) == bitboard.analyze_board(board)
+
+
+def test_symmetry_tables_invert():
+    for table, inverse in zip(bitboard.SYMMETRY_TABLES, bitboard.INVERSE_TABLES):
+        assert all(inverse[table[mask]] == mask for mask in range(1 << 9))
+
+
+def test_canonical_is_shared_by_symmetric_positions():
+    for board in ALL_BOARDS[::37]:
+        masks = bitboard.board_masks(board)
+        x, o, _ = bitboard.canonical(masks["X"], masks["O"])
+        for table in bitboard.SYMMETRY_TABLES:
+            assert bitboard.canonical(table[masks["X"]], table[masks["O"]])[:2] == (x, o)
+
+
+def test_canonical_symmetry_maps_back_to_the_board():
+    for board in ALL_BOARDS[::37]:
+        masks = bitboard.board_masks(board)
+        x, o, sym = bitboard.canonical(masks["X"], masks["O"])
+        inverse = bitboard.INVERSE_TABLES[sym]
+        assert (inverse[x], inverse[o]) == (masks["X"], masks["O"])
+
+
+@pytest.mark.parametrize("empty, phase", [(9, "opening"), (7, "opening"), (6, "midgame"),
+                                          (4, "midgame"), (3, "endgame"), (0, "endgame")])
+def test_game_phase_by_empty_cells(empty, phase):
+    assert bitboard.GAME_PHASES[empty] == phase
+
+
+def test_recommend_move_prefers_win_over_block():
+    board = [["O", "O", ""],
+             ["X", "X", ""],
+             ["X", "", ""]]
+    assert bitboard.recommend_move(bitboard.analyze_board(board)) == {"row": 0, "col": 2}
+
+
+def test_recommend_move_blocks_then_takes_center():
+    board = [["X", "X", ""],
+             ["", "", ""],
+             ["", "", "O"]]
+    assert bitboard.recommend_move(bitboard.analyze_board(board)) == {"row": 0, "col": 2}
+    empty = [["", "", ""] for _ in range(3)]
+    assert bitboard.recommend_move(bitboard.analyze_board(empty)) == {"row": 1, "col": 1}
+
+
+def test_recommend_move_on_full_board_is_none():
+    board = [["X", "O", "X"],
+             ["X", "O", "O"],
+             ["O", "X", "X"]]
+    assert bitboard.recommend_move(bitboard.analyze_board(board)) is None
+
+
+def test_board_cache_evicts_least_recently_used():
+    cache = bitboard.BoardCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_board_json_is_compact_and_memoized():
+    board = [["X", "", ""], ["", "O", ""], ["", "", ""]]
+    text = bitboard.board_json(board)
+    assert text == '[["X","",""],["","O",""],["","",""]]'
+    assert bitboard.board_json([row[:] for row in board]) is text
@@ -0,0 +1,49 @@
+"""
+Tests for the per-agent-call metrics the coordinator records on the game state
+"""
+import pytest
+
+from game.mcp_coordinator import MCPGameCoordinator
+
+
+@pytest.fixture
+def coordinator():
+    return MCPGameCoordinator()
+
+
+def test_successful_call_records_one_message(coordinator):
+    coordinator._record_agent_call("scout", 0.25, success=True, tokens=80)
+    state = coordinator.game_state
+    
+    assert state.mcp_message_count == 1
+    assert state.total_message_count == 1
+    assert state.agent_response_times["scout"] == [250.0]
+    assert state.message_latencies == [250.0]
+    assert state.message_flow_patterns["scout_to_strategist"] == 1
+    assert state.message_flow_patterns["error_responses"] == 0
+    assert state.token_usage_per_agent["scout"] == 80
+    assert state.protocol_errors == 0
+
+
+def test_failed_call_records_an_error(coordinator):
+    coordinator._record_agent_call("executor", 0.5, success=False, tokens=10)
+    state = coordinator.game_state
+    
+    assert state.agent_response_times["executor"] == [500.0]
+    assert state.message_flow_patterns["executor_to_scout"] == 0
+    assert state.message_flow_patterns["error_responses"] == 1
+    assert state.protocol_errors == 1
+    assert state.token_usage_per_agent["executor"] == 10
+
+
+def test_calls_accumulate_in_get_metrics(coordinator):
+    coordinator._record_agent_call("strategist", 0.1, success=True)
+    coordinator._record_agent_call("strategist", 0.3, success=True)
+    metrics = coordinator.game_state.get_metrics()
+    
+    assert metrics["mcp_message_count"] == 2
+    assert metrics["avg_response_times"]["strategist"] == pytest.approx(200.0)
+    assert metrics["avg_message_latency_ms"] == pytest.approx(200.0)
+    assert metrics["message_flow_patterns"]["strategist_to_executor"] == 2
+    # No token count given, so none is recorded
+    assert metrics["token_usage_per_agent"]["strategist"] == 0
@@ -0,0 +1,29 @@
+"""
+Tests for the shared LLM thread pool in utils/llm_pool.py
+"""
+import asyncio
+import threading
+
+from utils.llm_pool import run_llm_call
+
+
+def test_runs_on_the_llm_pool():
+    name = asyncio.run(run_llm_call(lambda: threading.current_thread().name))
+    assert name.startswith("llm-call")
+
+
+def test_passes_arguments_and_returns_the_result():
+    assert asyncio.run(run_llm_call(lambda a, b: a + b, 2, 3)) == 5
+
+
+def test_works_from_separate_event_loops():
+    # self_play runs one event loop per worker; the pool must not bind to the first one
+    async def many_calls():
+        return await asyncio.gather(*(run_llm_call(abs, -i) for i in range(20)))
+    
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(many_calls()) == list(range(20))
+        finally:
+            loop.close()
@@ -0,0 +1,157 @@
+"""
+Tests for the JSON-RPC dispatch behind POST /mcp/{agent_id} in main.py
+"""
+import asyncio
+
+import fastjsonschema
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+_ECHO_SCHEMA = {
+    "type": "object",
+    "properties": {"text": {"type": "string"}},
+    "required": ["text"]
+}
+
+
+async def _echo(arguments):
+    return {"echo": arguments["text"]}
+
+
+async def _boom(arguments):
+    raise RuntimeError("tool exploded")
+
+
+async def _cancelled(arguments):
+    raise asyncio.CancelledError()
+
+
+async def _unserializable(arguments):
+    return {"value": object()}
+
+
+def _tool(handler, schema):
+    return {"handler": handler, "needs_args": True, "validator": fastjsonschema.compile(schema)}
+
+
+@pytest.fixture
+def registries(monkeypatch):
+    registries = {
+        "tools": {
+            "echo": _tool(_echo, _ECHO_SCHEMA),
+            "boom": _tool(_boom, {"type": "object"}),
+            "cancelled": _tool(_cancelled, {"type": "object"}),
+            "unserializable": _tool(_unserializable, {"type": "object"})
+        },
+        "resources": {},
+        "prompts": {}
+    }
+    monkeypatch.setitem(main.agent_registries, "scout", registries)
+    monkeypatch.setattr(main, "scout_agent", object())
+    return registries
+
+
+def _dispatch(request):
+    return orjson.loads(asyncio.run(main._dispatch_mcp_request("scout", request)))
+
+
+def test_tools_call_returns_tool_result(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                          "params": {"name": "echo", "arguments": {"text": "hi"}}})
+    assert response["id"] == 1
+    assert orjson.loads(response["result"]["content"][0]["text"]) == {"echo": "hi"}
+
+
+def test_unknown_method_is_method_not_found(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 2, "method": "tools/explode"})
+    assert response["id"] == 2
+    assert response["error"]["code"] == -32601
+
+
+def test_unknown_tool_is_method_not_found(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "nope"}})
+    assert response["error"]["code"] == -32601
+
+
+def test_invalid_arguments_are_invalid_params(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 4, "method": "tools/call",
+                          "params": {"name": "echo", "arguments": {"text": 5}}})
+    assert response["id"] == 4
+    assert response["error"]["code"] == -32602
+
+
+def test_failing_tool_is_internal_error(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 5, "method": "tools/call",
+                          "params": {"name": "boom", "arguments": {}}})
+    assert response["error"] == {"code": -32603, "message": "tool exploded"}
+
+
+def test_non_object_request_is_invalid_request(registries):
+    response = _dispatch(1)
+    assert response["id"] is None
+    assert response["error"]["code"] == -32600
+
+
+def test_call_many_reports_a_failing_tool_per_call(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 6, "method": "tools/call_many", "params": {"calls": [
+        {"name": "echo", "arguments": {"text": "a"}},
+        {"name": "boom", "arguments": {}},
+        {"name": "echo", "arguments": {"text": "b"}}
+    ]}})
+    first, failed, last = response["result"]["results"]
+    assert orjson.loads(first["content"][0]["text"]) == {"echo": "a"}
+    assert failed == {"error": {"code": -32603, "message": "tool exploded"}}
+    assert orjson.loads(last["content"][0]["text"]) == {"echo": "b"}
+
+
+def test_call_many_reports_a_cancelled_call_per_call(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 8, "method": "tools/call_many", "params": {"calls": [
+        {"name": "cancelled", "arguments": {}},
+        {"name": "echo", "arguments": {"text": "a"}}
+    ]}})
+    cancelled, echoed = response["result"]["results"]
+    assert cancelled["error"] == {"code": -32603, "message": "CancelledError"}
+    assert orjson.loads(echoed["content"][0]["text"]) == {"echo": "a"}
+
+
+def test_call_many_reports_an_unserializable_result_per_call(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 9, "method": "tools/call_many", "params": {"calls": [
+        {"name": "unserializable", "arguments": {}},
+        {"name": "echo", "arguments": {"text": "a"}}
+    ]}})
+    failed, echoed = response["result"]["results"]
+    assert failed["error"]["code"] == -32603
+    assert failed["error"]["message"].startswith("Result not serializable")
+    assert orjson.loads(echoed["content"][0]["text"]) == {"echo": "a"}
+
+
+def test_call_many_rejects_bad_arguments_before_running(registries):
+    response = _dispatch({"jsonrpc": "2.0", "id": 7, "method": "tools/call_many", "params": {"calls": [
+        {"name": "echo", "arguments": {"text": "a"}},
+        {"name": "echo", "arguments": {}}
+    ]}})
+    assert response["error"]["code"] == -32602
+
+
+def test_empty_batch_is_a_single_invalid_request(registries):
+    response = TestClient(main.app).post("/mcp/scout", content=b"[]")
+    assert response.json() == {"jsonrpc": "2.0", "id": None,
+                               "error": {"code": -32600, "message": "Invalid Request"}}
+
+
+def test_batch_answers_each_member(registries):
+    body = orjson.dumps([
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "echo", "arguments": {"text": "x"}}},
+        1
+    ])
+    first, second = TestClient(main.app).post("/mcp/scout", content=body).json()
+    assert first["id"] == 1 and "result" in first
+    assert second["error"]["code"] == -32600
+
+
+def test_malformed_body_is_parse_error(registries):
+    response = TestClient(main.app).post("/mcp/scout", content=b"{not json")
+    assert response.json()["error"]["code"] == -32700
@@ -0,0 +1,85 @@
+"""
+Tests for the minimax move table and reply parsing in agents/optimized_local_agents.py
+"""
+from functools import lru_cache
+
+import pytest
+
+from agents.optimized_local_agents import MinimaxMoveTable, _extract_json
+from game.bitboard import WIN_LINES
+
+
+def _winner(key):
+    for a, b, c in WIN_LINES:
+        if key[a] != "." and key[a] == key[b] == key[c]:
+            return key[a]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _negamax(key, mover):
+    """Brute-force score for mover, using MinimaxMoveTable's scoring (faster wins score higher)"""
+    empties = key.count(".")
+    if _winner(key):
+        return -(empties + 1)
+    if empties == 0:
+        return 0
+    opponent = "O" if mover == "X" else "X"
+    return max(-_negamax(key[:i] + mover + key[i + 1:], opponent) for i in range(9) if key[i] == ".")
+
+
+def _reachable(key=".........", mover="X", seen=None):
+    """Every (key, mover) reachable from the empty board where mover still has a move"""
+    seen = set() if seen is None else seen
+    if (key, mover) in seen or _winner(key) or "." not in key:
+        return seen
+    seen.add((key, mover))
+    opponent = "O" if mover == "X" else "X"
+    for i in range(9):
+        if key[i] == ".":
+            _reachable(key[:i] + mover + key[i + 1:], opponent, seen)
+    return seen
+
+
+def _board(key):
+    return [[cell if cell != "." else "" for cell in key[r:r + 3]] for r in (0, 3, 6)]
+
+
+@pytest.fixture(scope="module")
+def table():
+    return MinimaxMoveTable()
+
+
+@pytest.mark.parametrize("mover", ["O", "X"])
+def test_best_move_is_optimal_on_every_reachable_board(table, mover):
+    positions = [key for key, side in _reachable() if side == mover]
+    assert positions
+    opponent = "O" if mover == "X" else "X"
+    for key in positions:
+        row, col = table.best_move(_board(key), mover)
+        i = 3 * row + col
+        assert key[i] == ".", key
+        assert -_negamax(key[:i] + mover + key[i + 1:], opponent) == _negamax(key, mover), key
+
+
+def test_best_move_on_finished_board_is_none(table):
+    assert table.best_move(_board("XXXOO...."), "O") is None
+    assert table.best_move(_board("XOXXOOOXX"), "X") is None
+
+
+def test_best_move_takes_the_win_over_the_block(table):
+    assert table.best_move(_board("OO.XX.X.."), "O") == (0, 2)
+
+
+def test_extract_json_handles_nested_objects_and_prose():
+    content = 'Sure! {"move": {"row": 1, "col": 2}, "reasoning": "block"} Hope that helps.'
+    assert _extract_json(content) == {"move": {"row": 1, "col": 2}, "reasoning": "block"}
+
+
+def test_extract_json_skips_unbalanced_braces():
+    assert _extract_json('{not json} then {"valid": true}') == {"valid": True}
+
+
+def test_extract_json_without_an_object_is_none():
+    assert _extract_json("no json here") is None
+    assert _extract_json("{broken") is None
@@ -0,0 +1,21 @@
+"""
+Clock Module
+Coarse ISO-8601 timestamps for response payloads and metrics
+"""
+import time
+from datetime import datetime
+from functools import lru_cache
+
+# Timestamps are rounded down to 100 ms buckets; payloads don't need finer resolution
+_BUCKET_NS = 100_000_000
+
+
+@lru_cache(maxsize=16)
+def _iso_for_bucket(bucket: int) -> str:
+    """Local-time ISO string for the start of a 100 ms bucket"""
+    return datetime.fromtimestamp(bucket * _BUCKET_NS / 1e9).isoformat()
+
+
+def iso_now() -> str:
+    """datetime.now().isoformat(), formatted at most once per 100 ms"""
+    return _iso_for_bucket(time.time_ns() // _BUCKET_NS)
@@ -64,6 +64,7 @@ class Config:
             "performance": {
                 "mcp_coordination_timeout": 15,
                 "agent_execution_timeout": 8,
+                "agent_pool_size": 1,
                 "enable_metrics": True
             }
         }
@@ -118,6 +119,10 @@ class Config:
         """Get agent execution timeout"""
         return self.get('performance', 'agent_execution_timeout', default=8)
     
+    def get_agent_pool_size(self) -> int:
+        """Get number of agent instances served per MCP server"""
+        return self.get('performance', 'agent_pool_size', default=1)
+    
     def is_metrics_enabled(self) -> bool:
         """Check if metrics are enabled"""
         return self.get('performance', 'enable_metrics', default=True)
@@ -0,0 +1,18 @@
+"""
+LLM Call Pool Module
+Runs blocking LLM client calls on one bounded thread pool shared by the process
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Upper bound on blocking LLM calls in flight; later calls queue on the pool
+# instead of piling threads onto the event loop's default executor
+MAX_CONCURRENT_LLM_CALLS = 16
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LLM_CALLS, thread_name_prefix="llm-call")
+
+
+async def run_llm_call(func: Callable[..., Any], *args: Any) -> Any:
+    """Await func(*args) on the shared LLM thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
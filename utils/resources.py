@@ -0,0 +1,77 @@
+"""
+Resource Sampling Module
+Samples CPU and memory usage on a background thread so metrics reads stay syscall-free
+"""
+import os
+import threading
+import time
+
+import psutil
+
+
+class ResourceSampler:
+    """Background 1 Hz sampler of system CPU/memory and this process's RSS
+
+    The sampling thread starts on first read. Readers get the latest
+    sample without touching /proc; values are replaced as a whole tuple,
+    so a read never mixes two samples.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._process = psutil.Process(os.getpid())
+        self._sample = (0.0, 0.0, 0.0)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _take_sample(self):
+        """Read current usage (cpu %, system memory MB, process RSS MB)"""
+        self._sample = (
+            psutil.cpu_percent(),
+            psutil.virtual_memory().used / (1024 * 1024),
+            self._process.memory_info().rss / (1024 * 1024)
+        )
+
+    def _run(self):
+        """Sampling loop for the daemon thread"""
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._take_sample()
+            except Exception:
+                pass
+
+    def _ensure_started(self):
+        """Start the sampling thread once, with an initial synchronous sample"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                try:
+                    self._take_sample()
+                except Exception:
+                    pass
+                self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+                self._thread.start()
+
+    @property
+    def cpu_percent(self) -> float:
+        """System-wide CPU utilisation from the latest sample"""
+        self._ensure_started()
+        return self._sample[0]
+
+    @property
+    def memory_mb(self) -> float:
+        """System memory in use (MB) from the latest sample"""
+        self._ensure_started()
+        return self._sample[1]
+
+    @property
+    def process_memory_mb(self) -> float:
+        """This process's resident memory (MB) from the latest sample"""
+        self._ensure_started()
+        return self._sample[2]
+
+
+# Singleton instance
+resource_sampler = ResourceSampler()